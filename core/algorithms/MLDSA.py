@@ -11,9 +11,9 @@ class MLDSA:
     MLDSA65 = 'dsa65'
     MLDSA87 = 'dsa87'
 
-    def __init__(self, params_set=MLDSA44):
+    def __init__(self, params_set=MLDSA44, arithmetic=None, log=None, parallel_attempts=1):
         self.config = import_module(f'core.constants.{params_set}')
-        self._mldsa = MLDSA_(self.config)
+        self._mldsa = MLDSA_(self.config, arithmetic, log, parallel_attempts)
 
     def keygen(self):
         seed = get_random_bytes(32)
@@ -21,6 +21,21 @@ class MLDSA:
             return None
         return self._mldsa.keygen(seed)
 
+    def keygen_batch(self, count):
+        """
+        Generates count key pairs from fresh random seeds in one batched pass
+
+        Args:
+            count: number of key pairs
+
+        Returns:
+            List[Tuple[bytes, bytes]]: count (public_key, private_key) pairs
+        """
+        return self._mldsa.keygen_batch([get_random_bytes(32) for _ in range(count)])
+
+    def expand_signing_key(self, private_key):
+        return self._mldsa.expand_signing_key(private_key)
+
     def sign(self, private_key, message, ctx):
         assert len(private_key) == 128 + 32*((self.config.D * self.config.K) + (self.config.K + self.config.L) * (2*self.config.ETA).bit_length()), f'Length of private key should be 896 bytes. Not {len(private_key)}'
 
@@ -30,11 +45,41 @@ class MLDSA:
         if randomness is None:
             return None
 
-        encoded_message = bytes_to_bits(int_to_bytes(0, 1) + int_to_bytes(len(ctx), 1) + ctx) + message
+        encoded_message = (bytes_to_bits(int_to_bytes(0, 1) + int_to_bytes(len(ctx), 1) + ctx).tolist() +
+                           list(message))
         return self._mldsa.sign(private_key, encoded_message, randomness)
 
+    def rejection_stats(self):
+        return self._mldsa.rejection_stats()
+
+    def expand_verification_key(self, public_key):
+        return self._mldsa.expand_verification_key(public_key)
+
     def verify(self, public_key, message, signature, ctx):
-        if len(signature) >= 256:
+        if len(ctx) >= 256:
             return False
-        encoded_message = bytes_to_bits(int_to_bytes(0, 1) + int_to_bytes(len(ctx), 1) + ctx) + message
+        encoded_message = (bytes_to_bits(int_to_bytes(0, 1) + int_to_bytes(len(ctx), 1) + ctx).tolist() +
+                           list(message))
         return self._mldsa.verify(public_key, encoded_message, signature)
+
+    def verify_batch(self, items, processes=None):
+        """
+        Verifies many (public_key, message, signature, ctx) tuples, grouping the work by public key
+
+        Args:
+            items: sequence of (public_key, message, signature, ctx) tuples
+            processes: number of worker processes (None or 1 verifies in this process)
+
+        Returns:
+            List[bool]: one result per item
+        """
+        items = list(items)
+        results = [False] * len(items)
+        encoded = [(index, (public_key, bytes_to_bits(int_to_bytes(0, 1) + int_to_bytes(len(ctx), 1) + ctx)
+                            .tolist() + list(message), signature))
+                   for index, (public_key, message, signature, ctx) in enumerate(items) if len(ctx) < 256]
+        if encoded:
+            indices, batch = zip(*encoded)
+            for index, result in zip(indices, self._mldsa.verify_batch(batch, processes)):
+                results[index] = result
+        return results
@@ -1,5 +1,6 @@
-from typing import Tuple, List, Any, Optional, Union
+from typing import Tuple, List, Any, Optional, Union, Callable, Dict, Iterable
 from core.subroutines.MLDSA_ import MLDSA_
+from core.subroutines.keys import ExpandedSigningKey, ExpandedVerificationKey
 
 
 class MLDSA:
@@ -9,11 +10,24 @@ class MLDSA:
     config: Any
     _mldsa: MLDSA_
 
-    def __init__(self, params_set: Optional[Union[MLDSA44, MLDSA87, MLDSA65]]=MLDSA44) -> None: ...
+    def __init__(self, params_set: Optional[Union[MLDSA44, MLDSA87, MLDSA65]]=MLDSA44,
+                 arithmetic: Optional[str] = None, log: Optional[Callable[[str], Any]] = None,
+                 parallel_attempts: int = 1) -> None: ...
 
     def keygen(self) -> Tuple[bytes, bytes]: ...
 
-    def sign(self, private_key: bytes, message: List[int], ctx: bytes) -> bytes: ...
+    def keygen_batch(self, count: int) -> List[Tuple[bytes, bytes]]: ...
 
-    def verify(self, public_key: bytes, message: List[int], signature: bytes, ctx: bytes) -> bool: ...
+    def expand_signing_key(self, private_key: bytes) -> ExpandedSigningKey: ...
 
+    def sign(self, private_key: Union[bytes, ExpandedSigningKey], message: List[int], ctx: bytes) -> bytes: ...
+
+    def rejection_stats(self) -> Dict[str, int]: ...
+
+    def expand_verification_key(self, public_key: bytes) -> ExpandedVerificationKey: ...
+
+    def verify(self, public_key: Union[bytes, ExpandedVerificationKey], message: List[int], signature: bytes,
+               ctx: bytes) -> bool: ...
+
+    def verify_batch(self, items: Iterable[Tuple[Union[bytes, ExpandedVerificationKey], List[int], bytes, bytes]],
+                     processes: Optional[int] = None) -> List[bool]: ...
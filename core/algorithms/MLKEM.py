@@ -9,13 +9,18 @@ class MLKEM:
     MLKEM768 = 'kem768'
     MLKEM1024 = 'kem1024'
 
-    def __init__(self, params_set=MLKEM512):
+    def __init__(self, params_set=MLKEM512, arithmetic=None, matrix_cache=None):
+        """
+        Keys, ciphers and shared secrets are only returned, never stored on the instance. One MLKEM object
+        can be shared by every thread of a pool and called concurrently.
+
+        Args:
+            params_set: one of MLKEM512, MLKEM768 or MLKEM1024
+            arithmetic: NTT arithmetic mode ('eager' or 'montgomery'), eager by default
+            matrix_cache: optional MatrixCache of expanded matrices keyed by rho
+        """
         self.config = import_module(f'core.constants.{params_set}')
-        self._ml_kem_internal = MLKEM_(self.config)
-        self.encapsulation_key = b''
-        self.decapsulation_key = b''
-        self.cipher = b''
-        self.shared_secret = b''
+        self._ml_kem_internal = MLKEM_(self.config, arithmetic, matrix_cache)
 
     def key_gen(self):
         """
@@ -29,34 +34,86 @@ class MLKEM:
         z = get_random_bytes(32)
         if d is None or z is None:
             return None
-        self.encapsulation_key, self.decapsulation_key = self._ml_kem_internal.keygen(d, z)
-        return self.encapsulation_key, self.decapsulation_key
+        return self._ml_kem_internal.keygen(d, z)
+
+    def key_gen_batch(self, count):
+        """
+        Generates count encapsulation keys and their decapsulation keys in one vectorized pass
+
+        Args:
+            count: number of key pairs
+
+        Returns:
+            List of count (encapsulation_key, decapsulation_key) tuples
+        """
+        ds = [get_random_bytes(32) for _ in range(count)]
+        zs = [get_random_bytes(32) for _ in range(count)]
+        if any(seed is None for seed in ds + zs):
+            return None
+        return self._ml_kem_internal.keygen_batch(ds, zs)
+
+    def expand_encapsulation_key(self, encapsulation_key):
+        """
+        Parses an encapsulation key once for repeated encapsulation to the same peer
+
+        Args:
+            encapsulation_key:  a 384K+32 sized byte key
+
+        Returns:
+            ExpandedEncapsulationKey: accepted by encapsulation in place of the raw key
+        """
+        return self._ml_kem_internal.expand_encapsulation_key(encapsulation_key)
 
     def encapsulation(self, encapsulation_key):
         """
         Uses the encapsulation key to generate a shared secret key and an associated ciphertext
 
         Args:
-            encapsulation_key:  a 384K+32 sized byte key
+            encapsulation_key:  a 384K+32 sized byte key or an ExpandedEncapsulationKey
 
         Returns:
             Tuple of Shared_secret_key and cipher_text
         """
 
         # TODO: Input Check for the encapsulation method
-        self.encapsulation_key = encapsulation_key
         m = get_random_bytes(32)
         if m is None:
             return None
-        self.shared_secret, self.cipher = self._ml_kem_internal.encapsulation(m, self.encapsulation_key)
-        return self.shared_secret, self.cipher
+        return self._ml_kem_internal.encapsulation(m, encapsulation_key)
+
+    def encapsulate_batch(self, encapsulation_keys):
+        """
+        Encapsulates to N encapsulation keys at once, one fresh random seed per key
+
+        Args:
+            encapsulation_keys: N 384K+32 sized byte keys or ExpandedEncapsulationKeys (repeats are allowed)
+
+        Returns:
+            List of N (Shared_secret_key, cipher_text) tuples
+        """
+        ms = [get_random_bytes(32) for _ in encapsulation_keys]
+        if any(m is None for m in ms):
+            return None
+        return self._ml_kem_internal.encapsulate_batch(encapsulation_keys, ms)
+
+    def expand_decapsulation_key(self, decapsulation_key):
+        """
+        Decodes a decapsulation key once for repeated decapsulation under the same static key
+
+        Args:
+            decapsulation_key: a 786k+96 sized byte key
+
+        Returns:
+            ExpandedDecapsulationKey: accepted by decapsulation in place of the raw key
+        """
+        return self._ml_kem_internal.expand_decapsulation_key(decapsulation_key)
 
     def decapsulation(self, decapsulation_key, cipher):
         """
         Uses the decapsulation key to produce a shared secret key from a ciphertext
 
         Args:
-            decapsulation_key: a 786k+96 sized byte key
+            decapsulation_key: a 786k+96 sized byte key or an ExpandedDecapsulationKey
             cipher: 32(duk) sized cipher text
 
         Returns:
@@ -64,6 +121,17 @@ class MLKEM:
         """
 
         # TODO: Input check for decapsulation method
-        self.decapsulation_key = decapsulation_key
-        self.shared_secret = self._ml_kem_internal.decapsulation(cipher, self.decapsulation_key)
-        return self.shared_secret
+        return self._ml_kem_internal.decapsulation(cipher, decapsulation_key)
+
+    def decapsulate_batch(self, decapsulation_key, ciphers):
+        """
+        Uses one decapsulation key to produce the shared secret keys of N ciphertexts at once
+
+        Args:
+            decapsulation_key: a 786k+96 sized byte key or an ExpandedDecapsulationKey
+            ciphers: N 32(duk) sized cipher texts
+
+        Returns:
+            List of N shared secret keys, a cipher that fails re-encryption only gets its own implicit rejection key
+        """
+        return self._ml_kem_internal.decapsulate_batch(ciphers, decapsulation_key)
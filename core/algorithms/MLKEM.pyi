@@ -1,5 +1,7 @@
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, Union, List
 from core.subroutines.MLKEM_ import MLKEM_
+from core.utils.cache import MatrixCache
+from core.subroutines.keys import ExpandedEncapsulationKey, ExpandedDecapsulationKey
 
 
 class MLKEM:
@@ -9,15 +11,24 @@ class MLKEM:
 
     config: Any
     _MLKEM_: MLKEM_
-    encapsulation_key: bytes
-    decapsulation_key: bytes
-    cipher: bytes
-    shared_secret: bytes
 
-    def __init__(self, params_set: Optional[str] = MLKEM512) -> None: ...
+    def __init__(self, params_set: Optional[str] = MLKEM512, arithmetic: Optional[str] = None,
+                 matrix_cache: Optional[MatrixCache] = None) -> None: ...
 
     def key_gen(self) -> Tuple[bytes, bytes]: ...
 
-    def encapsulation(self, encapsulation_key: bytes) -> Tuple[bytes, bytes]: ...
+    def key_gen_batch(self, count: int) -> List[Tuple[bytes, bytes]]: ...
 
-    def decapsulation(self, decapsulation_key: bytes, cipher: bytes) -> bytes: ...
\ No newline at end of file
+    def expand_encapsulation_key(self, encapsulation_key: bytes) -> ExpandedEncapsulationKey: ...
+
+    def encapsulation(self, encapsulation_key: Union[bytes, ExpandedEncapsulationKey]) -> Tuple[bytes, bytes]: ...
+
+    def encapsulate_batch(self, encapsulation_keys: List[Union[bytes, ExpandedEncapsulationKey]]
+                          ) -> List[Tuple[bytes, bytes]]: ...
+
+    def expand_decapsulation_key(self, decapsulation_key: bytes) -> ExpandedDecapsulationKey: ...
+
+    def decapsulation(self, decapsulation_key: Union[bytes, ExpandedDecapsulationKey], cipher: bytes) -> bytes: ...
+
+    def decapsulate_batch(self, decapsulation_key: Union[bytes, ExpandedDecapsulationKey],
+                          ciphers: List[bytes]) -> List[bytes]: ...
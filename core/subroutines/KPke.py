@@ -1,22 +1,24 @@
 import numpy as np
 
-from core.utils.bits import byte_encode, byte_decode, compress, decompress
+from core.utils.bits import byte_encode, byte_decode, byte_decode_vector, compress, decompress
 from core.utils.hash import sha3_512, prf
-from core.utils.ntt import NTT
+from core.utils.ntt import ArrayNTT
 
 
 class KPke:
-    def __init__(self, const):
+    def __init__(self, const, arithmetic=None, matrix_cache=None):
         """
-        Initializes a KPke object with a random seed
+        Initializes a KPke object. Every method keeps its state in locals, so one instance can be
+        shared between threads
 
         :param const: constants used for different algorithms
+        :param arithmetic: NTT arithmetic mode ('eager' or 'montgomery'), eager by default
+        :param matrix_cache: optional MatrixCache shared by engines, checked before resampling A
         """
-        self.ntt = NTT(const)
+        self.ntt = ArrayNTT(const, arithmetic)
+        self.matrix_cache = matrix_cache
         self.const = const
         self.k = const.K
-        self.encryption_key = None
-        self.decryption_key = None
 
     def keygen(self, d):
         """
@@ -28,30 +30,36 @@ class KPke:
         Returns:
             Tuple of (encryption_key, decryption_key)
         """
-        if self.encryption_key is not None and self.decryption_key is not None:
-            return self.encryption_key, self.decryption_key
         assert len(d) == 32, f"Length of random bytes {32}bytes. Not {len(d)}"
 
-        ro, sigma = sha3_512(d + self.k.to_bytes())
-        n = 0
-        s = [[0] * self.const.N for _ in range(self.k)]
-        e = [[0] * self.const.N for _ in range(self.k)]
-        A = [[[0] * self.const.N for _ in range(self.k)] for _ in range(self.k)]
-        for i in range(self.k):
-            for j in range(self.k):
-                A[i][j] = self.ntt.get_sample_ntt(ro + j.to_bytes() + i.to_bytes())
-        for i in range(self.k):
-            s[i] = self.ntt.get_sample_polyCBD(prf(sigma, n.to_bytes(), self.const.ETA), self.const.ETA)
-            n += 1
-        for j in range(self.k):
-            e[j] = self.ntt.get_sample_polyCBD(prf(sigma, n.to_bytes(), self.const.ETA), self.const.ETA)
-            n += 1
-        s_cap = [self.ntt.ntt(s[i]) for i in range(self.k)]
-        e_cap = [self.ntt.ntt(e[i]) for i in range(self.k)]
+        return self.keygen_batch([d])[0]
+
+    def keygen_batch(self, ds):
+        """
+        Generates N key pairs at once. The matrices, noise vectors, NTTs and encodings of all the seeds are
+        handled as stacked (N, ...) arrays and nothing is stored on the instance.
+
+        Args:
+            ds: N random seeds of 32 bytes
+
+        Returns:
+            List of N (encryption_key, decryption_key) tuples, identical to keygen(ds[i])
+        """
+        assert all(len(d) == 32 for d in ds), f"Length of random bytes {32}bytes."
+        if not ds:
+            return []
+
+        seeds = [sha3_512(d + self.k.to_bytes()) for d in ds]
+        A = self.sample_matrices([ro for ro, _ in seeds])
+        noise = self._sample_noise_batch([sigma for _, sigma in seeds], 0, 2 * self.k, self.const.ETA)
+        s, e = noise[:, :self.k], noise[:, self.k:]
+        s_cap = self.ntt.ntt(s)
+        e_cap = self.ntt.ntt(e)
         t_cap = self._add_vectors(self._multiply_array_vector_modified(A, s_cap), e_cap)
-        self.encryption_key = b''.join([byte_encode(t_cap[i], 12) for i in range(self.k)]) + ro
-        self.decryption_key = b''.join([byte_encode(s_cap[i], 12) for i in range(self.k)])
-        return self.encryption_key, self.decryption_key
+        encoded_t, encoded_s = byte_encode(t_cap, 12), byte_encode(s_cap, 12)
+        length = 384 * self.k
+        return [(encoded_t[i * length: (i + 1) * length] + ro, encoded_s[i * length: (i + 1) * length])
+                for i, (ro, _) in enumerate(seeds)]
 
     def encrypt(self, message, randomness, encryption_key):
         """
@@ -65,37 +73,104 @@ class KPke:
         Returns:
              return a cipher text of length 384k + 32
         """
-        assert len(message) == 32 and len(randomness) == 32, f"Length of message and randomness should be {32} bytes."
-
-        self.encryption_key = encryption_key
-        A = [[[0] * self.const.N for _ in range(self.k)] for _ in range(self.k)]
-        n = 0
-        t_cap = [byte_decode(self.encryption_key[i * 384: (i + 1) * 384], self.const.D) for i in range(self.k)]
-        ro = self.encryption_key[384 * self.k: 384 * self.k + 32]
-        for i in range(self.k):
-            for j in range(self.k):
-                A[i][j] = self.ntt.get_sample_ntt(ro + j.to_bytes() + i.to_bytes())
-        y = [[0] * self.const.N for _ in range(self.k)]
-        e1 = [[0] * self.const.N for _ in range(self.k)]
-        for i in range(self.k):
-            y[i] = self.ntt.get_sample_polyCBD(prf(randomness, n.to_bytes(), self.const.ETA), self.const.ETA)
-            n += 1
-        for j in range(self.k):
-            e1[j] = self.ntt.get_sample_polyCBD(prf(randomness, n.to_bytes(), self.const.ETA_2), self.const.ETA_2)
-            n += 1
-        e2 = self.ntt.get_sample_polyCBD(prf(randomness, n.to_bytes(), self.const.ETA_2), self.const.ETA_2)
-        y_cap = [self.ntt.ntt(y[i]) for i in range(self.k)]
+        t_cap, A = self.expand_encryption_key(encryption_key)
+        return self.encrypt_expanded(message, randomness, t_cap, A)
+
+    def expand_encryption_key(self, encryption_key):
+        """
+        Decodes t_cap and regenerates the matrix A of an encryption key. Both only depend on the key,
+        so they can be computed once and reused with encrypt_expanded
+
+        Args:
+            encryption_key: encryption_key of size 384k + 32
+
+        Returns:
+            Tuple: t_cap (k x 256), A (k x k x 256) in NTT form
+        """
+        t_cap = byte_decode_vector(encryption_key[:384 * self.k], self.const.D)
+        ro = encryption_key[384 * self.k: 384 * self.k + 32]
+        return t_cap, self.sample_matrix(ro)
+
+    def sample_matrix(self, ro):
+        """
+        Samples the matrix A in NTT form from the public seed ro, going through the matrix cache when there is one
+
+        Args:
+            ro: 32 byte seed
+
+        Returns:
+            Array of shape (k, k, 256) (read only when it comes from the cache)
+        """
+        if self.matrix_cache is not None:
+            return self.matrix_cache.get_or_create((self.k, bytes(ro)), lambda: self._sample_matrix(ro))
+        return self._sample_matrix(ro)
+
+    def sample_matrices(self, ros):
+        """
+        Samples the matrices A of several seeds, all together when there is no matrix cache
+
+        Args:
+            ros: N seeds of 32 bytes
+
+        Returns:
+            Array of shape (N, k, k, 256)
+        """
+        if self.matrix_cache is not None:
+            return np.stack([self.sample_matrix(ro) for ro in ros])
+        return self.ntt.get_sample_ntt_matrices([bytes(ro) for ro in ros], self.k)
+
+    def _sample_matrix(self, ro):
+        return self.ntt.get_sample_ntt_matrix(bytes(ro), self.k)
+
+    def encrypt_expanded(self, message, randomness, t_cap, A):
+        """
+        Generates a cipher text for the given message from an already expanded encryption key
+
+        Args:
+            message:  32 byte message
+            randomness: 32 byte random value
+            t_cap: decoded t_cap of the encryption key (k x 256)
+            A: matrix A of the encryption key in NTT form (k x k x 256)
+
+        Returns:
+             return a cipher text of length 32(du.k + dv)
+        """
+        return self.encrypt_batch([message], [randomness], t_cap, A)[0]
+
+    def encrypt_batch(self, messages, randomness, t_cap, A):
+        """
+        Encrypts N messages at once. Sampling, NTT, the matrix vector products, compression and encoding
+        all run over (N, k, 256) arrays. The key arrays either hold one key per message or a single key
+        that is broadcast over the batch.
+
+        Args:
+            messages: N messages of 32 bytes
+            randomness: N random values of 32 bytes
+            t_cap: decoded t_cap of the encryption keys, (N, k, 256) or (k, 256)
+            A: matrices A of the encryption keys in NTT form, (N, k, k, 256) or (k, k, 256)
+
+        Returns:
+             List of N cipher texts of length 32(du.k + dv)
+        """
+        assert len(messages) == len(randomness), "There should be one randomness per message."
+        assert all(len(message) == 32 for message in messages) and all(len(r) == 32 for r in randomness), \
+            f"Length of message and randomness should be {32} bytes."
+
+        batch = len(messages)
+        y = self._sample_noise_batch(randomness, 0, self.k, self.const.ETA)
+        errors = self._sample_noise_batch(randomness, self.k, self.k + 1, self.const.ETA_2)
+        e1, e2 = errors[:, :self.k], errors[:, self.k]
+        y_cap = self.ntt.ntt(y)
         u = self._multiply_array_transpose_vector(A, y_cap)
-        u = [self.ntt.ntt_inverse(u[i]) for i in range(self.k)]
-        u = [self._add_vectors(u[i], e1[i]) for i in range(self.k)]
-        mu = decompress(byte_decode(message, 1), 1)
+        u = self._add_vectors(self.ntt.ntt_inverse(u), e1)
+        mu = decompress(byte_decode_vector(b''.join(messages), 1), 1)
         v = self.ntt.ntt_inverse(self._multiply_vector_vector(t_cap, y_cap))
         v = self._add_vectors(self._add_vectors(v, e2), mu)
-        first_half_cipher = [byte_encode(compress(u[i], self.const.DU), self.const.DU) for i in range(self.k)]
+        first_half_cipher = byte_encode(compress(u, self.const.DU), self.const.DU)
         second_half_cipher = byte_encode(compress(v, self.const.DV), self.const.DV)
-        cipher = b''.join(first_half_cipher)
-        cipher += second_half_cipher
-        return cipher
+        first_length, second_length = 32 * self.const.DU * self.k, 32 * self.const.DV
+        return [first_half_cipher[i * first_length: (i + 1) * first_length] +
+                second_half_cipher[i * second_length: (i + 1) * second_length] for i in range(batch)]
 
     def decrypt(self, cipher, decryption_key):
         """
@@ -109,38 +184,77 @@ class KPke:
             a message of length 32 bytes
         """
 
-        self.decryption_key = decryption_key
-        first_half = cipher[0:32 * self.const.DU * self.k]
-        second_half = cipher[32 * self.const.DU * self.k:]
-        u = [decompress(byte_decode(first_half[32 * self.const.DU * i: 32 * self.const.DU * (i + 1)], self.const.DU),
-                        self.const.DU) for i in range(self.k)]
-        v = decompress(byte_decode(second_half, self.const.DV), self.const.DV)
-        s_cap = [byte_decode(self.decryption_key[i * 384: (i + 1) * 384], 12) for i in range(self.k)]
-        u_cap = [self.ntt.ntt(u[i]) for i in range(self.k)]
+        return self.decrypt_expanded(cipher, self.expand_decryption_key(decryption_key))
+
+    def expand_decryption_key(self, decryption_key):
+        """
+        Decodes s_cap from a decryption key
+
+        Args:
+            decryption_key: decryption_key of size 384k
+
+        Returns:
+            s_cap: Array of shape (k, 256)
+        """
+        return byte_decode_vector(decryption_key[:384 * self.k], 12)
+
+    def decrypt_expanded(self, cipher, s_cap):
+        """
+        Decrypts a cipher text with an already decoded decryption key
+
+        Args:
+            cipher: a cipher text of length 32(du.k + dv)
+            s_cap: decoded decryption key (k x 256)
+
+        Returns:
+            a message of length 32 bytes
+        """
+        return self.decrypt_batch([cipher], s_cap)[0]
+
+    def decrypt_batch(self, ciphers, s_cap):
+        """
+        Decrypts N cipher texts under one decoded decryption key, decoding and transforming all of them together
+
+        Args:
+            ciphers: N cipher texts of length 32(du.k + dv)
+            s_cap: decoded decryption key (k x 256)
+
+        Returns:
+            List of N messages of length 32 bytes
+        """
+        first_length = 32 * self.const.DU * self.k
+        if any(len(cipher) != first_length + 32 * self.const.DV for cipher in ciphers):
+            raise ValueError(f"Length of every cipher should be {first_length + 32 * self.const.DV}.")
+
+        first_half = b''.join(cipher[0:first_length] for cipher in ciphers)
+        second_half = b''.join(cipher[first_length:] for cipher in ciphers)
+        u = decompress(byte_decode_vector(first_half, self.const.DU), self.const.DU).reshape(len(ciphers), self.k,
+                                                                                             self.const.N)
+        v = decompress(byte_decode_vector(second_half, self.const.DV), self.const.DV)
+        u_cap = self.ntt.ntt(u)
         w = self.ntt.ntt_inverse(self._multiply_vector_vector(s_cap, u_cap))
         w = np.subtract(v, w) % self.const.Q
-        message = byte_encode(compress(w, 1), 1)
-        return message
+        messages = byte_encode(compress(w, 1), 1)
+        return [messages[32 * i: 32 * (i + 1)] for i in range(len(ciphers))]
+
+    def _sample_noise_batch(self, seeds, n, count, eta):
+        """
+        Samples count polynomials from D_eta(R_q) for every seed, with the PRF counters n, n + 1, ...
+
+        Returns:
+            Array of shape (len(seeds), count, 256)
+        """
+        byte_arrays = [prf(seed, (n + i).to_bytes(), eta) for seed in seeds for i in range(count)]
+        return self.ntt.get_sample_polyCBD_batch(byte_arrays, eta).reshape(len(seeds), count, self.const.N)
 
     def _multiply_vector_vector(self, vec1, vec2):
-        result = [0] * self.const.N
-        for i in range(self.k):
-            result = self._add_vectors(self.ntt.multiply_ntt(vec1[i], vec2[i]), result)
-        return result
+        return self.ntt.multiply_ntt(vec1, vec2).sum(axis=-2) % self.const.Q
 
     def _multiply_array_vector_modified(self, array, vector):
-        result = [[0] * self.const.N for _ in range(self.k)]
-        for i in range(self.k):
-            for j in range(self.k):
-                result[i] = self._add_vectors(self.ntt.multiply_ntt(array[i][j], vector[j]), result[i])
-        return result
+        return self.ntt.multiply_ntt(array, vector[..., None, :, :]).sum(axis=-2) % self.const.Q
 
     def _multiply_array_transpose_vector(self, array, vector):
-        result = [[0] * self.const.N for _ in range(self.k)]
-        for i in range(self.k):
-            for j in range(self.k):
-                result[i] = self._add_vectors(self.ntt.multiply_ntt(array[j][i], vector[j]), result[i])
-        return result
+        return self._multiply_array_vector_modified(np.swapaxes(array, -3, -2), vector)
 
     def _add_vectors(self, vec1, vec2):
         return np.add(vec1, vec2) % self.const.Q
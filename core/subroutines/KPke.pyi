@@ -1,27 +1,53 @@
-from typing import Tuple, List, Any, Union
-from core.utils.ntt import NTT
+from typing import Tuple, List, Any, Union, Optional
 
-Matrix = List[List[int]]
+import numpy as np
+
+from core.utils.cache import MatrixCache
+from core.utils.ntt import ArrayNTT
+
+Matrix = np.ndarray
 
 class KPke:
-    ntt: NTT
+    ntt: ArrayNTT
+    matrix_cache: Optional[MatrixCache]
     k: int
     const: Any
-    encryption_key: Union[bytes, None]
-    decryption_key: Union[bytes, None]
 
-    def __init__(self, const: Any) -> None: ...
+    def __init__(self, const: Any, arithmetic: Optional[str] = None,
+                 matrix_cache: Optional[MatrixCache] = None) -> None: ...
 
     def keygen(self, d: bytes) -> Tuple[bytes, bytes]: ...
 
+    def keygen_batch(self, ds: List[bytes]) -> List[Tuple[bytes, bytes]]: ...
+
     def encrypt(self, message: bytes, randomness: bytes, encryption_key: bytes) -> bytes: ...
 
+    def expand_encryption_key(self, encryption_key: bytes) -> Tuple[Matrix, Matrix]: ...
+
+    def sample_matrix(self, ro: bytes) -> Matrix: ...
+
+    def sample_matrices(self, ros: List[bytes]) -> Matrix: ...
+
+    def _sample_matrix(self, ro: bytes) -> Matrix: ...
+
+    def encrypt_expanded(self, message: bytes, randomness: bytes, t_cap: Matrix, A: Matrix) -> bytes: ...
+
+    def encrypt_batch(self, messages: List[bytes], randomness: List[bytes], t_cap: Matrix, A: Matrix) -> List[bytes]: ...
+
     def decrypt(self, cipher: bytes, decryption_key: bytes) -> bytes: ...
 
-    def _multiply_vector_vector(self, vec1: Matrix, vec2: Matrix) -> List[int]: ...
+    def expand_decryption_key(self, decryption_key: bytes) -> Matrix: ...
+
+    def decrypt_expanded(self, cipher: bytes, s_cap: Matrix) -> bytes: ...
+
+    def decrypt_batch(self, ciphers: List[bytes], s_cap: Matrix) -> List[bytes]: ...
+
+    def _sample_noise_batch(self, seeds: List[bytes], n: int, count: int, eta: int) -> Matrix: ...
+
+    def _multiply_vector_vector(self, vec1: Matrix, vec2: Matrix) -> np.ndarray: ...
 
-    def _multiply_array_vector_modified(self, array: List[Matrix], vector: Matrix) -> Matrix: ...
+    def _multiply_array_vector_modified(self, array: Matrix, vector: Matrix) -> Matrix: ...
 
-    def _multiply_array_transpose_vector(self, array: List[Matrix], vector: Matrix) -> Matrix: ...
+    def _multiply_array_transpose_vector(self, array: Matrix, vector: Matrix) -> Matrix: ...
 
-    def _add_vectors(self, vec1: Matrix | List[int], vec2: Matrix | List[int]) -> Matrix | List[int]: ...
+    def _add_vectors(self, vec1: Matrix | List[int], vec2: Matrix | List[int]) -> Matrix: ...
@@ -1,19 +1,45 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from itertools import repeat
+
+import numpy as np
 from Crypto.Hash import SHAKE256
 
+from core.subroutines.keys import ExpandedSigningKey, ExpandedVerificationKey
 from core.utils.bits import int_to_bytes, bytes_to_bits
 from core.utils.dsa.sampling import Sample
 from core.utils.dsa.encodings import Encodings
-from core.utils.overflow.stubborn import VectorNTT
-from core.utils.optimizers import power2_round, high_bits, low_bits, make_hint, mod_symmetric, use_hint
+from core.utils.overflow.stubborn import VectorNTT, arithmetic_for, centered
+from core.utils.optimizers import (power2_round_array, high_bits, low_bits, make_hint, mod_symmetric, use_hint,
+                                   high_bits_array, low_bits_array, make_hint_array, use_hint_array)
 
 
 class MLDSA_:
+    REJECTION_REASONS = ('z_norm', 'r0_norm', 'ct0_norm', 'hint_weight')
+
+    def __init__(self, const, arithmetic=None, log=None, parallel_attempts=1):
+        """
+        Every operation keeps its intermediate values in locals and the rejection counters are guarded by a
+        lock, so one instance can sign and verify from many threads at once.
+
+        Args:
+            const: constants of the parameter set
+            arithmetic: NTT arithmetic mode ('eager' or 'montgomery'), eager by default
+            log: optional callable receiving diagnostic messages, nothing is reported by default
+            parallel_attempts: number of consecutive signing attempts evaluated together (1 signs sequentially)
+        """
+        if parallel_attempts < 1:
+            raise ValueError("parallel_attempts should be at least 1.")
 
-    def __init__(self, const):
         self.const = const
+        self.arithmetic = arithmetic
+        self.log = log
+        self.parallel_attempts = parallel_attempts
         self.sample = Sample(const)
         self.encoding = Encodings(self.const)
-        self.check = None
+        self.rejections = dict.fromkeys(self.REJECTION_REASONS, 0)
+        self._lock = threading.Lock()
 
     def keygen(self, seed):
         """
@@ -26,26 +52,55 @@ class MLDSA_:
         """
         assert len(seed) == 32, "length of the seed should be 32 bytes."
 
-        hashed = SHAKE256.new(seed + int_to_bytes(self.const.K, 1) + int_to_bytes(self.const.L, 1)).read(128)
-        seed_A, seed_S, k = hashed[:32], hashed[32:96], hashed[96:]
+        return self.keygen_batch([seed])[0]
+
+    def keygen_batch(self, seeds):
+        """
+        Generates N public private key pairs. Sampling, NTTs, the matrix products, Power2Round and the
+        encodings run on stacked (N, ., 256) arrays
+        Args:
+            seeds: N Random 32 byte seeds
+
+        Returns:
+            List of N (Public key, Private key) tuples, identical to keygen(seeds[i])
+        """
+        assert all(len(seed) == 32 for seed in seeds), "length of the seed should be 32 bytes."
+        if not seeds:
+            return []
+
+        domain = int_to_bytes(self.const.K, 1) + int_to_bytes(self.const.L, 1)
+        hashed = [SHAKE256.new(seed + domain).read(128) for seed in seeds]
+        seeds_A, seeds_S, ks = [h[:32] for h in hashed], [h[32:96] for h in hashed], [h[96:] for h in hashed]
+        matrix = self.sample.expand_A_arrays(seeds_A)
+        s1, s2 = self.sample.expand_S_arrays(seeds_S)
+        arithmetic = arithmetic_for(self.const, self.arithmetic)
+        s1_cap = arithmetic.ntt(s1.copy(), 1)
+        t = arithmetic.ntt_inverse((matrix * s1_cap[:, None]).sum(axis=2) % self.const.Q, 1)
+        t1, t0 = power2_round_array((t + s2) % self.const.Q, self.const.Q, self.const.D)
+        public_keys = self.encoding.public_key_encode_batch(seeds_A, t1)
+        trs = [SHAKE256.new(public_key).read(64) for public_key in public_keys]
+        private_keys = self.encoding.private_key_encode_batch(seeds_A, ks, trs, s1, s2, t0)
+        return list(zip(public_keys, private_keys))
+
+    def expand_signing_key(self, private_key):
+        """
+        Decodes a private key once and caches everything signing needs that does not depend on the message
+        Args:
+            private_key: byte string representation of private key
+
+        Returns:
+            ExpandedSigningKey: accepted by sign in place of the raw key
+        """
+        seed_A, k, tr, s1, s2, t0 = self.encoding.private_key_decode(private_key)
+        s1_cap, s2_cap, t0_cap = s1.ntt(self.arithmetic), s2.ntt(self.arithmetic), t0.ntt(self.arithmetic)
         matrix_vector = self.sample.expand_A(seed_A)
-        s1, s2 = self.sample.expand_S(seed_S)
-        t = (s1.ntt() * matrix_vector).inverse() + s2
-        t1, t0 = VectorNTT(self.const), VectorNTT(self.const)
-        for i in range(self.const.K):
-            for j in range(256):
-                t1[i][j], t0[i][j] = power2_round(t[i][j], self.const.Q, self.const.D)
-        public_key = self.encoding.public_key_encode(seed_A, t1)
-        tr = SHAKE256.new(public_key).read(64)
-        private_key = self.encoding.private_key_encode(seed_A, k, tr, s1, s2, t0)
-        self.check = t
-        return public_key, private_key
+        return ExpandedSigningKey(private_key, seed_A, k, tr, s1_cap, s2_cap, t0_cap, matrix_vector)
 
     def sign(self, private_key, message, random):
         """
         Deterministic algorithm to generate a signature for a formatted message M
         Args:
-            private_key: byte string representation of private key
+            private_key: byte string representation of private key or an ExpandedSigningKey
             message: bit string of a message
             random: 32 bytes per message randomness or dummy variable
 
@@ -54,87 +109,285 @@ class MLDSA_:
         """
         assert len(random) == 32, "Length of the random number should be 32 bytes"
 
-        seed_A, k, tr, s1, s2, t0 = self.encoding.private_key_decode(private_key)
-        s1_cap, s2_cap, t0_cap = s1.ntt(), s2.ntt(), t0.ntt()
-        matrix_vector = self.sample.expand_A(seed_A)
-        repr_message = self._encode_message(tr, bytes(message), 64)
-        seed_mask = SHAKE256.new(k + random + repr_message).read(64)
+        if not isinstance(private_key, ExpandedSigningKey):
+            private_key = self.expand_signing_key(private_key)
+        repr_message = self._encode_message(private_key.tr, bytes(message), 64)
+        seed_mask = SHAKE256.new(private_key.k + random + repr_message).read(64)
+        if self.parallel_attempts > 1:
+            c_hat, signer_response, hint = self._speculative_attempts(private_key, repr_message, seed_mask)
+        else:
+            c_hat, signer_response, hint = self._sequential_attempts(private_key, repr_message, seed_mask)
+        signature = self.encoding.sign_encode(c_hat, signer_response.apply(mod_symmetric, self.const.Q), hint)
+        return signature
+
+    def _sequential_attempts(self, private_key, repr_message, seed_mask):
+        """
+        Tries kappa = 0, L, 2L, ... one after another until an attempt passes every check
+        Args:
+            private_key: ExpandedSigningKey
+            repr_message: 64 byte message representative
+            seed_mask: 64 byte seed of the masking vectors
+
+        Returns:
+            Tuple: c_hat, signer response z and hint of the first attempt that passes
+        """
+        s1_cap, s2_cap, t0_cap = private_key.s1_cap, private_key.s2_cap, private_key.t0_cap
+        matrix_vector = private_key.matrix_vector
         counter, iterations = 0, 0
-        c_hat = None
-        signer_response, hint = None, None
-        while signer_response is None or hint is None:
+        while True:
             iterations += 1
             y = self.sample.expand_mask(seed_mask, counter)
-            w = (y.ntt() * matrix_vector).inverse()
+            counter += self.const.L
+            w = (y.ntt(self.arithmetic) * matrix_vector).inverse(self.arithmetic)
             commitment = w.apply(high_bits, self.const.Q, self.const.GAMMA_2)
             c_hat = SHAKE256.new(repr_message + self.encoding.w1_encode(commitment)).read(self.const.LAMBDA // 4)
-            challenge = self.sample.sample_in_ball(c_hat)
-            c_cap = challenge.ntt()
-            rs1 = (s1_cap * c_cap).inverse()
-            rs2 = (s2_cap * c_cap).inverse()
-            signer_response = y + rs1
-            r0 = (w - rs2).apply(low_bits, self.const.Q, self.const.GAMMA_2)
-            if signer_response.norm() >= (self.const.GAMMA_1 - self.const.BETA) or r0.norm() >= (self.const.GAMMA_2 -
-                                                                                                 self.const.BETA):
-                print(f'Trying ...')
-                signer_response, hint = None, None
-            else:
-                rs0 = (t0_cap * c_cap).inverse()
-                hint = (-rs0).apply(make_hint, self.const.Q, self.const.GAMMA_2, other=(w - rs2) + rs0)
-                if rs0.norm() >= self.const.GAMMA_2 or self.count_ones(hint) > self.const.OMEGA:
-                    print(f'Edge case detected.Trying ...')
-                    signer_response, hint = None, None
-            counter += self.const.L
-        self.check = hint
-        print(f'successful after {iterations} iterations')
-        print('***********Prover side************')
-        print(f'commitment: {commitment}')
-        print('*********************************')
-        signature = self.encoding.sign_encode(c_hat, signer_response.apply(mod_symmetric, self.const.Q), hint)
-        return signature
+            c_cap = self.sample.sample_in_ball(c_hat).ntt(self.arithmetic)
+            # every check runs as soon as its operand is known, so a rejected attempt skips the transforms after it
+            signer_response = y + (s1_cap * c_cap).inverse(self.arithmetic)
+            if signer_response.norm() >= self.const.GAMMA_1 - self.const.BETA:
+                self._reject('z_norm')
+                continue
+            w_rs2 = w - (s2_cap * c_cap).inverse(self.arithmetic)
+            if w_rs2.apply(low_bits, self.const.Q, self.const.GAMMA_2).norm() >= self.const.GAMMA_2 - self.const.BETA:
+                self._reject('r0_norm')
+                continue
+            rs0 = (t0_cap * c_cap).inverse(self.arithmetic)
+            if rs0.norm() >= self.const.GAMMA_2:
+                self._reject('ct0_norm')
+                continue
+            hint = (-rs0).apply(make_hint, self.const.Q, self.const.GAMMA_2, other=w_rs2 + rs0)
+            if self.count_ones(hint) > self.const.OMEGA:
+                self._reject('hint_weight')
+                continue
+            self._log(f'successful after {iterations} iterations')
+            self._log(f'commitment: {commitment}')
+            return c_hat, signer_response, hint
+
+    def _speculative_attempts(self, private_key, repr_message, seed_mask):
+        """
+        Evaluates parallel_attempts consecutive kappa candidates at once on (B, ., 256) arrays and keeps the
+        lowest one that passes, so the result is the one _sequential_attempts returns. Rows are dropped from
+        the batch as soon as one of their checks fails.
+        Args:
+            private_key: ExpandedSigningKey
+            repr_message: 64 byte message representative
+            seed_mask: 64 byte seed of the masking vectors
+
+        Returns:
+            Tuple: c_hat, signer response z and hint of the first attempt that passes
+        """
+        const, q, batch = self.const, self.const.Q, self.parallel_attempts
+        arithmetic = arithmetic_for(const, self.arithmetic)
+        matrix = np.stack([row.array for row in private_key.matrix_vector])
+        s1_cap, s2_cap, t0_cap = private_key.s1_cap.array, private_key.s2_cap.array, private_key.t0_cap.array
+        counter, iterations = 0, 0
+        while True:
+            y = np.stack([self.sample.expand_mask(seed_mask, counter + b * const.L).array for b in range(batch)])
+            counter += batch * const.L
+            y_cap = arithmetic.ntt(y.copy(), 1)
+            w = arithmetic.ntt_inverse((matrix * y_cap[:, None]).sum(axis=2) % q, 1)
+            commitment = high_bits_array(w, q, const.GAMMA_2)
+            c_hats = [SHAKE256.new(repr_message + self.encoding.w1_encode(VectorNTT(const, row))).read(
+                const.LAMBDA // 4) for row in commitment]
+            c_cap = arithmetic.ntt(np.stack([self.sample.sample_in_ball(c_hat).polynomial for c_hat in c_hats]), 1)
+            c_cap = c_cap[:, None]
+
+            reasons = [None] * batch
+            alive = np.arange(batch)
+
+            def keep(failed, reason, *arrays):
+                for index in alive[failed]:
+                    reasons[index] = reason
+                return alive[~failed], *(array[~failed] for array in arrays)
+
+            z = (y + arithmetic.ntt_inverse(s1_cap * c_cap % q, 1)) % q
+            alive, z, w, c_cap = keep(self._norms(z) >= const.GAMMA_1 - const.BETA, 'z_norm', z, w, c_cap)
+            w_rs2 = (w - arithmetic.ntt_inverse(s2_cap * c_cap % q, 1)) % q
+            r0 = low_bits_array(w_rs2, q, const.GAMMA_2)
+            alive, z, w_rs2, c_cap = keep(self._norms(r0) >= const.GAMMA_2 - const.BETA, 'r0_norm', z, w_rs2, c_cap)
+            rs0 = arithmetic.ntt_inverse(t0_cap * c_cap % q, 1)
+            alive, z, w_rs2, rs0 = keep(self._norms(rs0) >= const.GAMMA_2, 'ct0_norm', z, w_rs2, rs0)
+            hint = make_hint_array(-rs0 % q, (w_rs2 + rs0) % q, q, const.GAMMA_2)
+            weight = np.count_nonzero(hint[:, :const.K] == 1, axis=(1, 2))
+            alive, z, hint = keep(weight > const.OMEGA, 'hint_weight', z, hint)
+
+            # attempts after the first passing one would never have run sequentially, they are not counted
+            first = alive[0] if len(alive) else batch
+            for reason in reasons[:first]:
+                self._reject(reason)
+            if first < batch:
+                iterations += first + 1
+                self._log(f'successful after {iterations} iterations')
+                self._log(f'commitment: {VectorNTT(const, commitment[first])}')
+                return c_hats[first], VectorNTT(const, z[0]), VectorNTT(const, hint[0])
+            iterations += batch
+
+    def _norms(self, array):
+        return np.abs(centered(array, self.const.Q)).max(axis=(1, 2))
+
+    def expand_verification_key(self, public_key):
+        """
+        Decodes a public key once and caches everything verification needs that does not depend on the signature
+        Args:
+            public_key: byte string representation of public key
+
+        Returns:
+            ExpandedVerificationKey: accepted by verify in place of the raw key
+        """
+        seed_A, t1 = self.encoding.public_key_decode(public_key)
+        matrix_vector = self.sample.expand_A(seed_A)
+        tr = SHAKE256.new(public_key).read(64)
+        scaled_t1 = (t1 * (2 ** self.const.D))
+        scaled_t1 = scaled_t1.apply(lambda x: x % self.const.Q).ntt(self.arithmetic)
+        return ExpandedVerificationKey(public_key, seed_A, tr, matrix_vector, scaled_t1)
 
     def verify(self, public_key, message, signature):
         """
         Verifies the signature of a message
         Args:
-            public_key: byte string representation of public key
+            public_key: byte string representation of public key or an ExpandedVerificationKey
             message: bit string of a message
             signature: byte string of a signature
 
         Returns:
             bool: True if signature is valid, False otherwise
         """
-        seed_A, t1 = self.encoding.public_key_decode(public_key)
         c_hat, signer_response, hint = self.encoding.sign_decode(signature)
         if hint is None:
-            print('Argh! Here we go again')
+            self._log('malformed hint, rejecting the signature')
             return False
-        matrix_vector = self.sample.expand_A(seed_A)
-        tr = SHAKE256.new(public_key).read(64)
-        repr_message = self._encode_message(tr, bytes(message), 64)
+        if not isinstance(public_key, ExpandedVerificationKey):
+            public_key = self.expand_verification_key(public_key)
+        repr_message = self._encode_message(public_key.tr, bytes(message), 64)
         challenge = self.sample.sample_in_ball(c_hat)
 
-        scaled_t1 = (t1 * (2 ** self.const.D))
-        scaled_t1 = scaled_t1.apply(lambda x: x % self.const.Q).ntt()
-        scaled_t1 = self.check.ntt()
+        scaled_t1 = public_key.scaled_t1_cap
         commitment_approx = (
-                (signer_response.ntt() * matrix_vector) - (scaled_t1 * challenge.ntt())
-        ).inverse()
+                (signer_response.ntt(self.arithmetic) * public_key.matrix_vector) -
+                (scaled_t1 * challenge.ntt(self.arithmetic))
+        ).inverse(self.arithmetic)
         commitment = hint.apply(use_hint, self.const.Q, self.const.GAMMA_2, other=commitment_approx)
 
         c_hat_decoded = SHAKE256.new(repr_message + self.encoding.w1_encode(commitment)).read(self.const.LAMBDA // 4)
-        print('***********Verifier side************')
-        print(f'scaled_t1: {scaled_t1}')
-        print(f'commitment: {commitment}')
-        print('************************************')
+        self._log(f'commitment: {commitment}')
         return c_hat == c_hat_decoded and signer_response.norm() < (self.const.GAMMA_1 - self.const.BETA)
 
+    def verify_batch(self, items, processes=None):
+        """
+        Verifies many signatures. Items are grouped by public key, every key is expanded once and the
+        signatures of a group are checked together on stacked arrays.
+        Args:
+            items: sequence of (public_key, message, signature) tuples, public keys as bytes or
+                ExpandedVerificationKeys
+            processes: number of worker processes sharing the groups (None or 1 verifies in this process)
+
+        Returns:
+            List[bool]: one result per item, identical to verify; a malformed signature gives False
+        """
+        items = list(items)
+        if processes is not None and processes > 1 and len(items) > 1:
+            return self._verify_batch_parallel(items, processes)
+
+        groups = {}
+        for index, (public_key, _, _) in enumerate(items):
+            groups.setdefault(bytes(public_key), []).append(index)
+        results = [False] * len(items)
+        for indices in groups.values():
+            public_key = items[indices[0]][0]
+            if not isinstance(public_key, ExpandedVerificationKey):
+                public_key = self.expand_verification_key(public_key)
+            group = self._verify_group(public_key, [items[index][1] for index in indices],
+                                       [items[index][2] for index in indices])
+            for index, result in zip(indices, group):
+                results[index] = result
+        return results
+
+    def _verify_group(self, public_key, messages, signatures):
+        """
+        Verifies N signatures under one expanded public key with (N, ., 256) arrays
+        Args:
+            public_key: ExpandedVerificationKey
+            messages: N bit strings
+            signatures: N byte strings
+
+        Returns:
+            List[bool]: one result per signature
+        """
+        const, q = self.const, self.const.Q
+        results = [False] * len(signatures)
+        decoded = []
+        for index, signature in enumerate(signatures):
+            try:
+                c_hat, signer_response, hint = self.encoding.sign_decode(signature)
+            except ValueError:
+                self._log('malformed signature, rejecting it')
+                continue
+            if hint is None:
+                self._log('malformed hint, rejecting the signature')
+                continue
+            decoded.append((index, c_hat, signer_response.array, hint.array))
+        if not decoded:
+            return results
+
+        arithmetic = arithmetic_for(const, self.arithmetic)
+        indices, c_hats, z, hint = zip(*decoded)
+        z, hint = np.stack(z), np.stack(hint)
+        matrix = np.stack([row.array for row in public_key.matrix_vector])
+        c_cap = arithmetic.ntt(np.stack([self.sample.sample_in_ball(c_hat).polynomial for c_hat in c_hats]), 1)
+        z_cap = arithmetic.ntt(z.copy(), 1)
+        commitment_approx = arithmetic.ntt_inverse(
+            ((matrix * z_cap[:, None]).sum(axis=2) - public_key.scaled_t1_cap.array * c_cap[:, None]) % q, 1)
+        commitment = use_hint_array(hint, commitment_approx, q, const.GAMMA_2)
+        norms = self._norms(z)
+        for row, index in enumerate(indices):
+            repr_message = self._encode_message(public_key.tr, bytes(messages[index]), 64)
+            w1 = self.encoding.w1_encode(VectorNTT(const, commitment[row]))
+            c_hat_decoded = SHAKE256.new(repr_message + w1).read(const.LAMBDA // 4)
+            results[index] = c_hats[row] == c_hat_decoded and bool(norms[row] < const.GAMMA_1 - const.BETA)
+        return results
+
+    def _verify_batch_parallel(self, items, processes):
+        """
+        Splits the items, kept in groups of the same public key, into one chunk per process and runs
+        verify_batch on every chunk in a process pool
+        """
+        order = sorted(range(len(items)), key=lambda index: bytes(items[index][0]))
+        size = -(-len(items) // processes)
+        chunks = [order[start: start + size] for start in range(0, len(order), size)]
+        payloads = [[(bytes(items[index][0]), list(items[index][1]), bytes(items[index][2])) for index in chunk]
+                    for chunk in chunks]
+        results = [False] * len(items)
+        with ProcessPoolExecutor(processes) as pool:
+            for chunk, chunk_results in zip(chunks, pool.map(_verify_chunk, repeat(self.const.__name__),
+                                                              repeat(self.arithmetic), payloads)):
+                for index, result in zip(chunk, chunk_results):
+                    results[index] = result
+        return results
+
+    def rejection_stats(self):
+        """
+        Returns:
+            dict: number of signing attempts rejected for each reason since the engine was created
+        """
+        with self._lock:
+            return dict(self.rejections)
+
+    def _reject(self, reason):
+        with self._lock:
+            self.rejections[reason] += 1
+        self._log(f'attempt rejected: {reason}')
+
+    def _log(self, message):
+        if self.log is not None:
+            self.log(message)
+
     @staticmethod
     def _encode_message(tr, message, length):
-        return SHAKE256.new(bytes(bytes_to_bits(tr)) + message).read(length)
+        return SHAKE256.new(bytes_to_bits(tr).tobytes() + message).read(length)
 
     def count_ones(self, hint):
-        count = 0
-        for i in range(self.const.K):
-            count += hint[i].polynomial.count(1)
-        return count
+        return int(np.count_nonzero(hint.array[:self.const.K] == 1))
+
+
+def _verify_chunk(config_name, arithmetic, items):
+    return MLDSA_(import_module(config_name), arithmetic).verify_batch(items)
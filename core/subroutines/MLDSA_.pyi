@@ -1,23 +1,67 @@
-from typing import Tuple, Any, List, Optional
+import threading
+from typing import Tuple, Any, List, Optional, Union, Callable, Dict, Iterable
 
+import numpy as np
+
+from core.subroutines.keys import ExpandedSigningKey, ExpandedVerificationKey
 from core.utils.dsa.encodings import Encodings
 from core.utils.dsa.sampling import Sample
 from core.utils.overflow.stubborn import VectorNTT
 
 class MLDSA_:
+    REJECTION_REASONS: Tuple[str, ...]
     const: Any
+    arithmetic: Optional[str]
+    log: Optional[Callable[[str], Any]]
+    parallel_attempts: int
     sample: Sample
     encoding: Encodings
-    check: Optional[VectorNTT]
+    rejections: Dict[str, int]
+    _lock: threading.Lock
 
-    def __init__(self, const: Any) -> None: ...
+    def __init__(self, const: Any, arithmetic: Optional[str] = None,
+                 log: Optional[Callable[[str], Any]] = None, parallel_attempts: int = 1) -> None: ...
 
     def keygen(self, seed: bytes) -> Tuple[bytes, bytes]: ...
 
-    def sign(self, private_key: bytes, message: List[int], randomness: bytes) -> bytes: ...
+    def keygen_batch(self, seeds: List[bytes]) -> List[Tuple[bytes, bytes]]: ...
+
+    def expand_signing_key(self, private_key: bytes) -> ExpandedSigningKey: ...
+
+    def sign(self, private_key: Union[bytes, ExpandedSigningKey], message: List[int], randomness: bytes) -> bytes: ...
+
+    def _sequential_attempts(self, private_key: ExpandedSigningKey, repr_message: bytes,
+                             seed_mask: bytes) -> Tuple[bytes, VectorNTT, VectorNTT]: ...
+
+    def _speculative_attempts(self, private_key: ExpandedSigningKey, repr_message: bytes,
+                              seed_mask: bytes) -> Tuple[bytes, VectorNTT, VectorNTT]: ...
+
+    def _norms(self, array: np.ndarray) -> np.ndarray: ...
+
+    def expand_verification_key(self, public_key: bytes) -> ExpandedVerificationKey: ...
+
+    def verify(self, public_key: Union[bytes, ExpandedVerificationKey], message: List[int], signature: bytes) -> bool: ...
 
-    def verify(self, public_key: bytes, message: List[int], signature: bytes) -> bool: ...
+    def verify_batch(self, items: Iterable[Tuple[Union[bytes, ExpandedVerificationKey], List[int], bytes]],
+                     processes: Optional[int] = None) -> List[bool]: ...
 
-    def _encode_message(self, tr: bytes, message: bytes, length: int): ...
+    def _verify_group(self, public_key: ExpandedVerificationKey, messages: List[List[int]],
+                      signatures: List[bytes]) -> List[bool]: ...
+
+    def _verify_batch_parallel(self, items: List[Tuple[Union[bytes, ExpandedVerificationKey], List[int], bytes]],
+                               processes: int) -> List[bool]: ...
+
+    def rejection_stats(self) -> Dict[str, int]: ...
+
+    def _reject(self, reason: str) -> None: ...
+
+    def _log(self, message: str) -> None: ...
+
+    @staticmethod
+    def _encode_message(tr: bytes, message: bytes, length: int): ...
 
     def count_ones(self, hint: VectorNTT) -> int: ...
+
+
+def _verify_chunk(config_name: str, arithmetic: Optional[str], items: List[Tuple[bytes, List[int], bytes]]
+                  ) -> List[bool]: ...
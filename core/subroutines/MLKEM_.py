@@ -1,18 +1,22 @@
+import numpy as np
+
 from core.subroutines.KPke import KPke
+from core.subroutines.keys import ExpandedEncapsulationKey, ExpandedDecapsulationKey
 from core.utils.hash import sha3_256, sha3_512, shake256
 
 
 class MLKEM_:
-    def __init__(self, const):
+    def __init__(self, const, arithmetic=None, matrix_cache=None):
         """
-        Initializes a ml_kem_internal object never use it directly use MLKEM instead
+        Initializes a ml_kem_internal object never use it directly use MLKEM instead.
+        Nothing is stored per call, one instance can serve many threads at once
 
         :param const: a constant file
+        :param arithmetic: NTT arithmetic mode ('eager' or 'montgomery'), eager by default
+        :param matrix_cache: optional MatrixCache of expanded matrices keyed by rho
         """
         self.const = const
-        self.kpke = KPke(const)
-        self.encapsulation_key = b''
-        self.decapsulation_key = b''
+        self.kpke = KPke(const, arithmetic, matrix_cache)
 
     def keygen(self, d, z):
         """
@@ -26,10 +30,44 @@ class MLKEM_:
             Tuple of encapsulation_key, decapsulation_key
         """
 
-        self.encapsulation_key, self.decapsulation_key = self.kpke.keygen(d)
-        self.decapsulation_key = b''.join([self.decapsulation_key, self.encapsulation_key, sha3_256(
-            self.encapsulation_key), z])
-        return self.encapsulation_key, self.decapsulation_key
+        encapsulation_key, decryption_key = self.kpke.keygen(d)
+        decapsulation_key = b''.join([decryption_key, encapsulation_key, sha3_256(encapsulation_key), z])
+        return encapsulation_key, decapsulation_key
+
+    def keygen_batch(self, ds, zs):
+        """
+        Generates N pairs of keys for encapsulation and decapsulation in one vectorized pass
+
+        Args:
+            ds: N 32 byte random seeds
+            zs: N 32 byte randoms for implicit rejection
+
+        Returns:
+            List of N (encapsulation_key, decapsulation_key) tuples, identical to keygen(ds[i], zs[i])
+        """
+        if len(ds) != len(zs):
+            raise ValueError(f"Got {len(ds)} seeds d for {len(zs)} seeds z")
+
+        return [(encapsulation_key, b''.join([decryption_key, encapsulation_key, sha3_256(encapsulation_key), z]))
+                for (encapsulation_key, decryption_key), z in zip(self.kpke.keygen_batch(ds), zs)]
+
+    def expand_encapsulation_key(self, encapsulation_key):
+        """
+        Parses an encapsulation key once: hashes it and decodes t_cap and A so that
+        repeated encapsulations to the same key skip that work
+
+        Args:
+            encapsulation_key: encapsulation_key of length 384k+32
+
+        Returns:
+            ExpandedEncapsulationKey: the parsed key
+        """
+        if len(encapsulation_key) != 384 * self.const.K + 32:
+            raise ValueError(f"Length of encapsulation key should be {384 * self.const.K + 32}. "
+                             f"Not {len(encapsulation_key)}")
+
+        t_cap, A = self.kpke.expand_encryption_key(encapsulation_key)
+        return ExpandedEncapsulationKey(encapsulation_key, sha3_256(encapsulation_key), t_cap, A)
 
     def encapsulation(self, m, encapsulation_key):
         """
@@ -37,38 +75,117 @@ class MLKEM_:
 
         Args:
             m:  32 byte random seed
-            encapsulation_key: encapsulation_key of length 384k+32
+            encapsulation_key: encapsulation_key of length 384k+32 or an ExpandedEncapsulationKey
 
         Returns:
             Tuple: Shared secret key, cipher
         """
 
-        self.encapsulation_key = encapsulation_key
-        shared_secret_key, r = sha3_512(m + sha3_256(self.encapsulation_key))
-        cipher = self.kpke.encrypt(m, r, self.encapsulation_key)
+        if not isinstance(encapsulation_key, ExpandedEncapsulationKey):
+            encapsulation_key = self.expand_encapsulation_key(encapsulation_key)
+        if encapsulation_key.k != self.const.K:
+            raise ValueError(f"Expanded key is for k={encapsulation_key.k}, this instance uses k={self.const.K}")
+
+        shared_secret_key, r = sha3_512(m + encapsulation_key.hashed)
+        cipher = self.kpke.encrypt_expanded(m, r, encapsulation_key.t_cap, encapsulation_key.A)
         return shared_secret_key, cipher
 
+    def encapsulate_batch(self, encapsulation_keys, ms):
+        """
+        Runs N encapsulations at once, stacking the expanded keys into (N, k, 256) and (N, k, k, 256) arrays.
+        Each result is identical to encapsulation(ms[i], encapsulation_keys[i]).
+
+        Args:
+            encapsulation_keys: N encapsulation keys of length 384k+32 or ExpandedEncapsulationKeys
+            ms: N 32 byte random seeds
+
+        Returns:
+            List of N (shared_secret_key, cipher) tuples
+        """
+        if len(encapsulation_keys) != len(ms):
+            raise ValueError(f"Got {len(encapsulation_keys)} encapsulation keys for {len(ms)} seeds")
+        if not ms:
+            return []
+
+        keys = [key if isinstance(key, ExpandedEncapsulationKey) else self.expand_encapsulation_key(key)
+                for key in encapsulation_keys]
+        if any(key.k != self.const.K for key in keys):
+            raise ValueError(f"Every expanded key should be for k={self.const.K}")
+
+        secrets = [sha3_512(m + key.hashed) for m, key in zip(ms, keys)]
+        ciphers = self.kpke.encrypt_batch(ms, [r for _, r in secrets], np.stack([key.t_cap for key in keys]),
+                                          np.stack([key.A for key in keys]))
+        return [(shared_secret_key, cipher) for (shared_secret_key, _), cipher in zip(secrets, ciphers)]
+
+    def expand_decapsulation_key(self, decapsulation_key):
+        """
+        Decodes a decapsulation key once: s_cap, t_cap, A, h and z are cached so that
+        repeated decapsulations under the same key skip that work
+
+        Args:
+            decapsulation_key: 768k+96 sized decapsulation key
+
+        Returns:
+            ExpandedDecapsulationKey: the decoded key
+        """
+        if len(decapsulation_key) != 768 * self.const.K + 96:
+            raise ValueError(f"Length of decapsulation key should be {768 * self.const.K + 96}. "
+                             f"Not {len(decapsulation_key)}")
+
+        decryption_key = decapsulation_key[0: 384 * self.const.K]
+        encryption_key = decapsulation_key[384 * self.const.K:768 * self.const.K + 32]
+        h = decapsulation_key[768 * self.const.K + 32: 768 * self.const.K + 64]
+        z = decapsulation_key[768 * self.const.K + 64:768 * self.const.K + 96]
+        t_cap, A = self.kpke.expand_encryption_key(encryption_key)
+        return ExpandedDecapsulationKey(decapsulation_key, self.kpke.expand_decryption_key(decryption_key),
+                                        ExpandedEncapsulationKey(encryption_key, h, t_cap, A), z)
+
     def decapsulation(self, c, decapsulation_key):
         """
         Reconstructs the shared_secret_key using cipher and decapsulation_key
 
         Args:
             c: 32(duk) sized cipher
-            decapsulation_key: 786k+96 sized decryption_key
+            decapsulation_key: 786k+96 sized decryption_key or an ExpandedDecapsulationKey
 
         Returns:
             bytes: shared_secret_key using kpke
         """
 
-        self.decapsulation_key = decapsulation_key
-        decryption_key = self.decapsulation_key[0: 384 * self.const.K]
-        encryption_key = self.decapsulation_key[384 * self.const.K:768 * self.const.K + 32]
-        h = self.decapsulation_key[768 * self.const.K + 32: 768 * self.const.K + 64]
-        z = self.decapsulation_key[768 * self.const.K + 64:768 * self.const.K + 96]
-        m = self.kpke.decrypt(c, decryption_key)
-        shared_secret_key, r = sha3_512(b''.join([m, h]))
-        shared_secret_key_check = shake256(b''.join([z, m]))
-        c_check = self.kpke.encrypt(m, r, encryption_key)
+        if not isinstance(decapsulation_key, ExpandedDecapsulationKey):
+            decapsulation_key = self.expand_decapsulation_key(decapsulation_key)
+        if decapsulation_key.k != self.const.K:
+            raise ValueError(f"Expanded key is for k={decapsulation_key.k}, this instance uses k={self.const.K}")
+
+        m = self.kpke.decrypt_expanded(c, decapsulation_key.s_cap)
+        shared_secret_key, r = sha3_512(b''.join([m, decapsulation_key.h]))
+        shared_secret_key_check = shake256(b''.join([decapsulation_key.z, m]))
+        c_check = self.kpke.encrypt_expanded(m, r, decapsulation_key.t_cap, decapsulation_key.A)
         if c != c_check:
             shared_secret_key = shared_secret_key_check
         return shared_secret_key
+
+    def decapsulate_batch(self, cs, decapsulation_key):
+        """
+        Reconstructs the shared secret keys of N ciphers under one decapsulation key. Decryption, hashing and
+        re-encryption run over the whole batch, implicit rejection is decided for every cipher on its own.
+
+        Args:
+            cs: N 32(duk) sized ciphers
+            decapsulation_key: 786k+96 sized decryption_key or an ExpandedDecapsulationKey
+
+        Returns:
+            List of N shared secret keys, identical to decapsulation(cs[i], decapsulation_key)
+        """
+        if not isinstance(decapsulation_key, ExpandedDecapsulationKey):
+            decapsulation_key = self.expand_decapsulation_key(decapsulation_key)
+        if decapsulation_key.k != self.const.K:
+            raise ValueError(f"Expanded key is for k={decapsulation_key.k}, this instance uses k={self.const.K}")
+        if not cs:
+            return []
+
+        ms = self.kpke.decrypt_batch(cs, decapsulation_key.s_cap)
+        secrets = [sha3_512(b''.join([m, decapsulation_key.h])) for m in ms]
+        c_checks = self.kpke.encrypt_batch(ms, [r for _, r in secrets], decapsulation_key.t_cap, decapsulation_key.A)
+        return [shared_secret_key if c == c_check else shake256(b''.join([decapsulation_key.z, m]))
+                for c, c_check, m, (shared_secret_key, _) in zip(cs, c_checks, ms, secrets)]
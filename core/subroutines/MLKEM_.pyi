@@ -1,17 +1,30 @@
-from typing import Tuple, Any, Union
+from typing import Tuple, Any, Union, Optional, List
 from core.subroutines.KPke import KPke
+from core.utils.cache import MatrixCache
+from core.subroutines.keys import ExpandedEncapsulationKey, ExpandedDecapsulationKey
 
 
 class MLKEM_:
     const: Any
     kpke: KPke
-    encapsulation_key: Union[bytes, None]
-    decapsulation_key: Union[bytes, None]
 
-    def __init__(self, const: Any) -> None: ...
+    def __init__(self, const: Any, arithmetic: Optional[str] = None,
+                 matrix_cache: Optional[MatrixCache] = None) -> None: ...
 
     def keygen(self, d: bytes, z: bytes) -> Tuple[bytes, bytes]: ...
 
-    def encapsulation(self, m: bytes, encapsulation_key: bytes) -> Tuple[bytes, bytes]: ...
+    def keygen_batch(self, ds: List[bytes], zs: List[bytes]) -> List[Tuple[bytes, bytes]]: ...
 
-    def decapsulation(self, c: bytes, decapsulation_key: bytes) -> bytes: ...
\ No newline at end of file
+    def expand_encapsulation_key(self, encapsulation_key: bytes) -> ExpandedEncapsulationKey: ...
+
+    def encapsulation(self, m: bytes, encapsulation_key: Union[bytes, ExpandedEncapsulationKey]) -> Tuple[bytes, bytes]: ...
+
+    def encapsulate_batch(self, encapsulation_keys: List[Union[bytes, ExpandedEncapsulationKey]],
+                          ms: List[bytes]) -> List[Tuple[bytes, bytes]]: ...
+
+    def expand_decapsulation_key(self, decapsulation_key: bytes) -> ExpandedDecapsulationKey: ...
+
+    def decapsulation(self, c: bytes, decapsulation_key: Union[bytes, ExpandedDecapsulationKey]) -> bytes: ...
+
+    def decapsulate_batch(self, cs: List[bytes],
+                          decapsulation_key: Union[bytes, ExpandedDecapsulationKey]) -> List[bytes]: ...
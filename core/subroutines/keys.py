@@ -0,0 +1,137 @@
+class ExpandedEncapsulationKey:
+    """
+    An ML-KEM encapsulation key parsed once, for repeated encapsulation to the same peer.
+    Use MLKEM.expand_encapsulation_key (or MLKEM_.expand_encapsulation_key) to build one.
+
+    Attributes:
+        key: raw encapsulation key of length 384k+32
+        hashed: H(ek), the sha3_256 hash of the raw key
+        t_cap: decoded t_cap of the key (k x 256, read only)
+        A: matrix A in NTT form regenerated from the key's seed (k x k x 256, read only)
+    """
+    def __init__(self, key, hashed, t_cap, A):
+        self.key = key
+        self.hashed = hashed
+        self.t_cap = t_cap
+        self.A = A
+        self.t_cap.setflags(write=False)
+        self.A.setflags(write=False)
+
+    @property
+    def k(self):
+        return self.t_cap.shape[0]
+
+    def __bytes__(self):
+        return self.key
+
+    def __repr__(self):
+        return f'ExpandedEncapsulationKey(k={self.k}, H(ek)={self.hashed.hex()[:16]}...)'
+
+
+class ExpandedDecapsulationKey:
+    """
+    An ML-KEM decapsulation key decoded once, for decapsulating many ciphertexts under the same static key.
+    Use MLKEM.expand_decapsulation_key (or MLKEM_.expand_decapsulation_key) to build one.
+
+    Attributes:
+        key: raw decapsulation key of length 768k+96
+        s_cap: decoded s_cap of the key (k x 256, read only)
+        encapsulation_key: ExpandedEncapsulationKey of the embedded encapsulation key, holding t_cap, A and h
+        z: 32 byte implicit rejection value
+    """
+    def __init__(self, key, s_cap, encapsulation_key, z):
+        self.key = key
+        self.s_cap = s_cap
+        self.encapsulation_key = encapsulation_key
+        self.z = z
+        self.s_cap.setflags(write=False)
+
+    @property
+    def k(self):
+        return self.s_cap.shape[0]
+
+    @property
+    def t_cap(self):
+        return self.encapsulation_key.t_cap
+
+    @property
+    def A(self):
+        return self.encapsulation_key.A
+
+    @property
+    def h(self):
+        return self.encapsulation_key.hashed
+
+    def __bytes__(self):
+        return self.key
+
+    def __repr__(self):
+        return f'ExpandedDecapsulationKey(k={self.k}, H(ek)={self.h.hex()[:16]}...)'
+
+
+class ExpandedSigningKey:
+    """
+    An ML-DSA private key decoded once, for signing many messages with the same key.
+    Use MLDSA.expand_signing_key (or MLDSA_.expand_signing_key) to build one.
+
+    Attributes:
+        key: raw private key bytes
+        seed_A: 32 byte public seed of the matrix A
+        k: 32 byte private signing seed K
+        tr: 64 byte hash of the public key
+        s1_cap: NTT(s1) as a VectorNTT (L)
+        s2_cap: NTT(s2) as a VectorNTT (K)
+        t0_cap: NTT(t0) as a VectorNTT (K)
+        matrix_vector: matrix A in NTT form (K vectors of length L)
+    """
+    def __init__(self, key, seed_A, k, tr, s1_cap, s2_cap, t0_cap, matrix_vector):
+        self.key = key
+        self.seed_A = seed_A
+        self.k = k
+        self.tr = tr
+        self.s1_cap = s1_cap
+        self.s2_cap = s2_cap
+        self.t0_cap = t0_cap
+        self.matrix_vector = matrix_vector
+        for vector in (s1_cap, s2_cap, t0_cap, *matrix_vector):
+            vector.array.setflags(write=False)
+
+    def __bytes__(self):
+        return self.key
+
+    def __len__(self):
+        return len(self.key)
+
+    def __repr__(self):
+        return f'ExpandedSigningKey(tr={self.tr.hex()[:16]}...)'
+
+
+class ExpandedVerificationKey:
+    """
+    An ML-DSA public key decoded once, for verifying many signatures from the same issuer.
+    Use MLDSA.expand_verification_key (or MLDSA_.expand_verification_key) to build one.
+
+    Attributes:
+        key: raw public key bytes
+        seed_A: 32 byte public seed of the matrix A
+        tr: 64 byte hash of the public key
+        matrix_vector: matrix A in NTT form (K vectors of length L)
+        scaled_t1_cap: NTT(t1 * 2^d) as a VectorNTT (K)
+    """
+    def __init__(self, key, seed_A, tr, matrix_vector, scaled_t1_cap):
+        self.key = key
+        self.seed_A = seed_A
+        self.tr = tr
+        self.matrix_vector = matrix_vector
+        self.scaled_t1_cap = scaled_t1_cap
+        for vector in (scaled_t1_cap, *matrix_vector):
+            vector.array.setflags(write=False)
+
+    def __bytes__(self):
+        return self.key
+
+    def __len__(self):
+        return len(self.key)
+
+    def __repr__(self):
+        return f'ExpandedVerificationKey(tr={self.tr.hex()[:16]}...)'
@@ -0,0 +1,84 @@
+from typing import List
+
+import numpy as np
+
+from core.utils.overflow.stubborn import VectorNTT
+
+
+class ExpandedEncapsulationKey:
+    key: bytes
+    hashed: bytes
+    t_cap: np.ndarray
+    A: np.ndarray
+
+    def __init__(self, key: bytes, hashed: bytes, t_cap: np.ndarray, A: np.ndarray) -> None: ...
+
+    @property
+    def k(self) -> int: ...
+
+    def __bytes__(self) -> bytes: ...
+
+    def __repr__(self) -> str: ...
+
+
+class ExpandedDecapsulationKey:
+    key: bytes
+    s_cap: np.ndarray
+    encapsulation_key: ExpandedEncapsulationKey
+    z: bytes
+
+    def __init__(self, key: bytes, s_cap: np.ndarray, encapsulation_key: ExpandedEncapsulationKey,
+                 z: bytes) -> None: ...
+
+    @property
+    def k(self) -> int: ...
+
+    @property
+    def t_cap(self) -> np.ndarray: ...
+
+    @property
+    def A(self) -> np.ndarray: ...
+
+    @property
+    def h(self) -> bytes: ...
+
+    def __bytes__(self) -> bytes: ...
+
+    def __repr__(self) -> str: ...
+
+
+class ExpandedSigningKey:
+    key: bytes
+    seed_A: bytes
+    k: bytes
+    tr: bytes
+    s1_cap: VectorNTT
+    s2_cap: VectorNTT
+    t0_cap: VectorNTT
+    matrix_vector: List[VectorNTT]
+
+    def __init__(self, key: bytes, seed_A: bytes, k: bytes, tr: bytes, s1_cap: VectorNTT, s2_cap: VectorNTT,
+                 t0_cap: VectorNTT, matrix_vector: List[VectorNTT]) -> None: ...
+
+    def __bytes__(self) -> bytes: ...
+
+    def __len__(self) -> int: ...
+
+    def __repr__(self) -> str: ...
+
+
+class ExpandedVerificationKey:
+    key: bytes
+    seed_A: bytes
+    tr: bytes
+    matrix_vector: List[VectorNTT]
+    scaled_t1_cap: VectorNTT
+
+    def __init__(self, key: bytes, seed_A: bytes, tr: bytes, matrix_vector: List[VectorNTT],
+                 scaled_t1_cap: VectorNTT) -> None: ...
+
+    def __bytes__(self) -> bytes: ...
+
+    def __len__(self) -> int: ...
+
+    def __repr__(self) -> str: ...
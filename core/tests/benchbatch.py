@@ -0,0 +1,51 @@
+import random
+import timeit
+
+import core.constants.dsa44 as dsa44
+import core.constants.kem768 as kem768
+from core.subroutines.MLDSA_ import MLDSA_
+from core.subroutines.MLKEM_ import MLKEM_
+
+ml_kem = MLKEM_(kem768)
+encapsulation_key, decapsulation_key = ml_kem.keygen(random.randbytes(32), random.randbytes(32))
+expanded_encapsulation_key = ml_kem.expand_encapsulation_key(encapsulation_key)
+expanded_decapsulation_key = ml_kem.expand_decapsulation_key(decapsulation_key)
+
+
+def report(name, size, single, batched):
+    single_time = min(timeit.repeat(single, number=3, repeat=3)) / 3
+    batched_time = min(timeit.repeat(batched, number=3, repeat=3)) / 3
+    for label, elapsed in (('single calls', single_time), (name, batched_time)):
+        print(f'{label:<26}{size:>6}{elapsed * 1e3:>12.2f}{size / elapsed:>10.0f}')
+
+
+print(f'{"ML-KEM-768":<26}{"N":>6}{"ms/batch":>12}{"ops/s":>10}')
+for size in (1, 8, 32, 128):
+    keys, ms = [expanded_encapsulation_key] * size, [random.randbytes(32) for _ in range(size)]
+    ciphers = [cipher for _, cipher in ml_kem.encapsulate_batch(keys, ms)]
+    report('encapsulate_batch', size, lambda: [ml_kem.encapsulation(m, key) for m, key in zip(ms, keys)],
+           lambda: ml_kem.encapsulate_batch(keys, ms))
+    ds, zs = [random.randbytes(32) for _ in range(size)], [random.randbytes(32) for _ in range(size)]
+    report('keygen_batch', size, lambda: [MLKEM_(kem768).keygen(d, z) for d, z in zip(ds, zs)],
+           lambda: ml_kem.keygen_batch(ds, zs))
+    report('decapsulate_batch', size,
+           lambda: [ml_kem.decapsulation(cipher, expanded_decapsulation_key) for cipher in ciphers],
+           lambda: ml_kem.decapsulate_batch(ciphers, expanded_decapsulation_key))
+
+ml_dsa = MLDSA_(dsa44)
+print(f'\n{"ML-DSA-44":<26}{"N":>6}{"ms/batch":>12}{"ops/s":>10}')
+for size in (1, 8, 32, 128):
+    seeds = [random.randbytes(32) for _ in range(size)]
+    report('keygen_batch', size, lambda: [ml_dsa.keygen(seed) for seed in seeds],
+           lambda: ml_dsa.keygen_batch(seeds))
+
+public_key, private_key = ml_dsa.keygen(random.randbytes(32))
+expanded_verification_key = ml_dsa.expand_verification_key(public_key)
+print()
+for size in (1, 8, 32, 128):
+    items = []
+    for _ in range(size):
+        message = [random.randrange(2) for _ in range(16)]
+        items.append((expanded_verification_key, message, ml_dsa.sign(private_key, message, random.randbytes(32))))
+    report('verify_batch', size, lambda: [ml_dsa.verify(*item) for item in items],
+           lambda: ml_dsa.verify_batch(items))
@@ -0,0 +1,105 @@
+import random
+import timeit
+
+import numpy as np
+
+import os
+
+from core.utils.bits import byte_encode, byte_decode, byte_decode_vector, bytes_to_bits, bits_to_bytes
+
+Q = 3329
+
+
+def reference_bytes_to_bits(byte_array):
+    """
+    The list based bytes_to_bits this module replaced, kept to compare against
+    """
+    bit_array = []
+    for byte in byte_array:
+        for _ in range(8):
+            bit_array.append(byte % 2)
+            byte //= 2
+    return bit_array
+
+
+def reference_bits_to_bytes(bit_array):
+    """
+    The per bit bits_to_bytes this module replaced, kept to compare against
+    """
+    byte_array = bytearray(len(bit_array) // 8)
+    for i in range(len(bit_array)):
+        byte_array[i // 8] += bit_array[i] * (1 << (i % 8))
+    return bytes(byte_array)
+
+
+def reference_byte_encode(f, d):
+    """
+    The bit by bit byte_encode this module replaced, kept to compare against
+    """
+    b = [0] * (256 * d)
+    for i in range(256):
+        a = f[i]
+        for j in range(d):
+            b[i * d + j] = a % 2
+            a = (a - b[i * d + j]) // 2
+    return reference_bits_to_bytes(b)
+
+
+def reference_byte_decode(byte_array, d):
+    """
+    The bit by bit byte_decode this module replaced, kept to compare against
+    """
+    bit_array = reference_bytes_to_bits(byte_array)
+    f = [0] * 256
+    for i in range(256):
+        for j in range(d):
+            f[i] += bit_array[i * d + j] * (2 ** j)
+        f[i] %= (2 ** d) if d < 12 else Q
+    return f
+
+
+def best(function, number=20):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+print(f'{"d":>3}{"encode ref us":>16}{"encode us":>12}{"decode ref us":>16}{"decode us":>12}{"k=4 vector us":>16}')
+for d in range(1, 13):
+    bound = 2 ** d if d < 12 else Q
+    polynomial = [random.randrange(bound) for _ in range(256)]
+    encoded = reference_byte_encode(polynomial, d)
+    assert byte_encode(polynomial, d) == encoded, f'byte_encode differs for d={d}'
+    assert byte_decode(encoded, d).tolist() == reference_byte_decode(encoded, d), f'byte_decode differs for d={d}'
+    random_bytes = bytes(random.getrandbits(8) for _ in range(32 * d))
+    assert byte_decode(random_bytes, d).tolist() == reference_byte_decode(random_bytes, d)
+
+    vector = np.array([[random.randrange(bound) for _ in range(256)] for _ in range(4)])
+    vector_bytes = byte_encode(vector, d)
+    assert vector_bytes == b''.join(reference_byte_encode(row, d) for row in vector.tolist())
+    assert np.array_equal(byte_decode_vector(vector_bytes, d), vector)
+
+    print(f'{d:>3}{best(lambda: reference_byte_encode(polynomial, d)) * 1e6:>16.1f}'
+          f'{best(lambda: byte_encode(polynomial, d)) * 1e6:>12.1f}'
+          f'{best(lambda: reference_byte_decode(encoded, d)) * 1e6:>16.1f}'
+          f'{best(lambda: byte_decode(encoded, d)) * 1e6:>12.1f}'
+          f'{best(lambda: byte_decode_vector(byte_encode(vector, d), d)) * 1e6:>16.1f}')
+
+
+def throughput(function, size):
+    number = max(1, (1 << 20) // size)
+    return size / best(function, number) / 2 ** 20
+
+
+print()
+print(f'{"bytes":>8}{"to bits ref MB/s":>18}{"to bits MB/s":>14}{"to bytes ref MB/s":>19}{"to bytes MB/s":>15}')
+for size in (32, 256, 4096, 65536, 1 << 20):
+    data = os.urandom(size)
+    bits = bytes_to_bits(data)
+    assert bits_to_bytes(bits) == data
+    if size <= 65536:
+        assert bits.tolist() == reference_bytes_to_bits(data)
+        reference = (f'{throughput(lambda: reference_bytes_to_bits(data), size):>18.2f}',
+                     f'{throughput(lambda: reference_bits_to_bytes(bits.tolist()), size):>19.2f}')
+    else:
+        reference = (f'{"-":>18}', f'{"-":>19}')
+    print(f'{size:>8}{reference[0]}{throughput(lambda: bytes_to_bits(data), size):>14.1f}'
+          f'{reference[1]}{throughput(lambda: bits_to_bytes(bits), size):>15.1f}')
@@ -0,0 +1,57 @@
+import timeit
+
+import numpy as np
+
+import core.constants.dsa44 as dsa44
+import core.constants.kem768 as kem768
+from core.utils.arithmetic import ModularArithmetic, MontgomeryArithmetic
+
+
+class Counting:
+    """
+    Mixin counting the coefficients that go through a modular reduction
+    """
+    count = 0
+
+    def reduce(self, a):
+        self.count += a.size
+        return super().reduce(a)
+
+    def montgomery_reduce(self, a):
+        self.count += a.size
+        return super().montgomery_reduce(a)
+
+
+class CountingEager(Counting, ModularArithmetic):
+    pass
+
+
+class CountingMontgomery(Counting, MontgomeryArithmetic):
+    pass
+
+
+def reductions(arithmetic, transform, min_length):
+    arithmetic.count = 0
+    transform(np.zeros(256, dtype=np.int64), min_length)
+    return arithmetic.count
+
+
+PARAMETERS = [
+    ('ML-KEM-768', kem768.Q, kem768.ZETA_VALUES, 3303, 2, kem768.K),
+    ('ML-DSA-44', dsa44.Q, dsa44.ZETA_VALUES, dsa44.NTT_SCALE_FACTOR, 1, dsa44.K),
+]
+
+print(f'{"params":<12}{"mode":<12}{"fwd mods":>10}{"inv mods":>10}{"fwd us":>10}{"inv us":>10}')
+for name, q, zeta_values, scale_factor, min_length, k in PARAMETERS:
+    block = np.random.randint(0, q, size=(k, 256)).astype(np.int64)
+    for arithmetic_class, counting_class in ((ModularArithmetic, CountingEager),
+                                             (MontgomeryArithmetic, CountingMontgomery)):
+        counting = counting_class(q, zeta_values, scale_factor)
+        forward = reductions(counting, counting.ntt, min_length)
+        inverse = reductions(counting, counting.ntt_inverse, min_length)
+        plain = arithmetic_class(q, zeta_values, scale_factor)
+        forward_time = min(timeit.repeat(lambda: plain.ntt(block.copy(), min_length), number=200, repeat=5)) / 200
+        inverse_time = min(timeit.repeat(lambda: plain.ntt_inverse(block.copy(), min_length), number=200,
+                                         repeat=5)) / 200
+        print(f'{name:<12}{plain.mode:<12}{forward:>10}{inverse:>10}{forward_time * 1e6:>10.1f}'
+              f'{inverse_time * 1e6:>10.1f}')
@@ -0,0 +1,30 @@
+import random
+
+import core.constants.dsa44 as const
+from core.utils.advbits import simple_bit_pack, simple_bit_unpack, bit_pack, bit_unpack, bit_unpack_vector
+from core.utils.bits import int_to_bits
+from core.utils.overflow.stubborn import NTTModified, VectorNTT
+
+
+def reference_pack(coefficients, width):
+    bits = ''.join(int_to_bits(coefficient, width) for coefficient in coefficients)
+    return bytes(int(bits[i: i + 8][::-1], 2) for i in range(0, len(bits), 8))
+
+
+# Every width ML-DSA packs: w1 (4, 6), eta (3, 4), t1 (10), t0 (13) and z (18, 20)
+for start, end in [(0, 15), (0, 43), (2, 2), (4, 4), (0, 1023), (4095, 4096), (131071, 131072), (524287, 524288)]:
+    width = (start + end).bit_length()
+    coefficients = [random.randint(-start, end) for _ in range(256)]
+    polynomial = NTTModified(const, coefficients)
+    if start == 0:
+        packed = simple_bit_pack(polynomial, end)
+        assert packed == reference_pack(coefficients, width), f'simple_bit_pack differs for width {width}'
+        assert simple_bit_unpack(packed, end) == polynomial
+    else:
+        packed = bit_pack(polynomial, start, end)
+        assert packed == reference_pack([end - c for c in coefficients], width), f'bit_pack differs for width {width}'
+        assert bit_unpack(packed, start, end) == polynomial
+        vector = VectorNTT(const, [polynomial, NTTModified(const, coefficients[::-1])])
+        assert bit_unpack_vector(bit_pack(vector, start, end), start, end) == vector
+
+print('advbits packing matches the bit string definition')
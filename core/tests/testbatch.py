@@ -0,0 +1,89 @@
+import random
+
+from Crypto.Hash import SHAKE256
+
+import core.constants.dsa44 as dsa44
+import core.constants.kem512 as kem512
+import core.constants.kem768 as kem768
+import core.constants.kem1024 as kem1024
+from core.algorithms.MLDSA import MLDSA
+from core.subroutines.MLDSA_ import MLDSA_
+from core.subroutines.MLKEM_ import MLKEM_
+from core.utils.optimizers import power2_round_array
+from core.utils.overflow.stubborn import VectorNTT
+
+for const in (kem512, kem768, kem1024):
+    ml_kem = MLKEM_(const)
+    ds, zs = [random.randbytes(32) for _ in range(3)], [random.randbytes(32) for _ in range(3)]
+    keys = ml_kem.keygen_batch(ds, zs)
+    assert keys == [MLKEM_(const).keygen(d, z) for d, z in zip(ds, zs)], f'batched keygen differs for k={const.K}'
+    assert ml_kem.keygen_batch([], []) == []
+    encapsulation_keys = [keys[i % 3][0] for i in range(7)]
+    encapsulation_keys[1] = ml_kem.expand_encapsulation_key(encapsulation_keys[1])
+    ms = [random.randbytes(32) for _ in encapsulation_keys]
+
+    results = ml_kem.encapsulate_batch(encapsulation_keys, ms)
+    assert results == [MLKEM_(const).encapsulation(m, key) for m, key in zip(ms, encapsulation_keys)], \
+        f'batched encapsulation differs for k={const.K}'
+    assert ml_kem.encapsulate_batch([], []) == []
+
+    decapsulation_key = keys[0][1]
+    encapsulated = ml_kem.encapsulate_batch([keys[0][0]] * 5, ms[:5])
+    ciphers = [cipher for _, cipher in encapsulated]
+    # tampered ciphers only get their own implicit rejection key
+    ciphers[1] = bytes([ciphers[1][0] ^ 1]) + ciphers[1][1:]
+    ciphers[3] = ciphers[3][:-1] + bytes([ciphers[3][-1] ^ 128])
+    shared_secrets = ml_kem.decapsulate_batch(ciphers, decapsulation_key)
+    assert shared_secrets == [MLKEM_(const).decapsulation(cipher, decapsulation_key) for cipher in ciphers], \
+        f'batched decapsulation differs for k={const.K}'
+    assert [shared_secret == secret for shared_secret, (secret, _) in zip(shared_secrets, encapsulated)] == [True, False, True, False, True]
+
+print('batched keygen, encapsulation and decapsulation match single calls')
+
+for arithmetic in (None, 'montgomery'):
+    ml_dsa = MLDSA_(dsa44, arithmetic)
+    seeds = [random.randbytes(32) for _ in range(5)]
+    expected = []
+    for seed in seeds:
+        # the polynomial-by-polynomial key generation every batched key must match
+        hashed = SHAKE256.new(seed + bytes([dsa44.K, dsa44.L])).read(128)
+        s1, s2 = ml_dsa.sample.expand_S(hashed[32:96])
+        t = (s1.ntt(arithmetic) * ml_dsa.sample.expand_A(hashed[:32])).inverse(arithmetic) + s2
+        t1, t0 = (VectorNTT(dsa44, array) for array in power2_round_array(t.array, dsa44.Q, dsa44.D))
+        public_key = ml_dsa.encoding.public_key_encode(hashed[:32], t1)
+        tr = SHAKE256.new(public_key).read(64)
+        expected.append((public_key, ml_dsa.encoding.private_key_encode(hashed[:32], hashed[96:], tr, s1, s2, t0)))
+    assert ml_dsa.keygen_batch(seeds) == expected, f'batched ML-DSA key generation differs for {arithmetic}'
+    assert [ml_dsa.keygen(seed) for seed in seeds] == expected
+    assert ml_dsa.keygen_batch([]) == []
+
+assert [len(key) for key in MLDSA().keygen_batch(3)[2]] == [1312, 2560]
+print('batched ML-DSA key generation matches single key generation')
+
+ml_dsa = MLDSA_(dsa44)
+dsa_keys = [ml_dsa.keygen(random.randbytes(32)) for _ in range(2)]
+items = []
+for i in range(8):
+    public_key, private_key = dsa_keys[i % 2]
+    message = [random.randrange(2) for _ in range(8)]
+    signature = ml_dsa.sign(private_key, message, random.randbytes(32))
+    if i == 2:
+        message = message[::-1] + [1]
+    if i == 5:
+        signature = bytes([signature[0] ^ 1]) + signature[1:]
+    if i == 6:
+        public_key = ml_dsa.expand_verification_key(public_key)
+    items.append((public_key, message, signature))
+expected = [ml_dsa.verify(*item) for item in items]
+assert expected.count(False) == 2
+assert ml_dsa.verify_batch(items) == expected, 'batched verification differs'
+assert ml_dsa.verify_batch(items, processes=2) == expected, 'multiprocess verification differs'
+assert ml_dsa.verify_batch(items[:1] + [(dsa_keys[0][0], [1], b'too short')]) == [True, False]
+
+wrapper = MLDSA()
+public_key, private_key = wrapper.keygen()
+signature = wrapper.sign(private_key, [1, 0, 1], b'context')
+assert wrapper.verify_batch([(public_key, [1, 0, 1], signature, b'context'), (public_key, [1, 0, 1], signature, b''),
+                             (public_key, [1, 0, 1], signature, bytes(256))]) == [True, False, False]
+
+print('batched ML-DSA verification matches single verification')
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from Crypto.Random import get_random_bytes
+
+import core.constants.kem512 as const
+from core.subroutines.MLKEM_ import MLKEM_
+from core.utils.cache import MatrixCache
+
+# LRU bounds
+cache = MatrixCache(max_entries=2, max_bytes=3 * 8 * 256)
+for key in ('a', 'b', 'c'):
+    cache.put(key, np.zeros(256, dtype=np.int64))
+assert len(cache) == 2 and 'a' not in cache, 'least recently used entry should be evicted'
+assert cache.get('b') is not None and cache.get('a') is None
+assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+cache.put('big', np.zeros(4 * 256, dtype=np.int64))
+assert 'big' not in cache, 'entries larger than the byte budget should not be stored'
+
+# Engines sharing a cache give the same results as engines without one
+cache = MatrixCache(max_entries=16)
+cached, plain = MLKEM_(const, matrix_cache=cache), MLKEM_(const)
+d, z, m = get_random_bytes(32), get_random_bytes(32), get_random_bytes(32)
+encapsulation_key, decapsulation_key = cached.keygen(d, z)
+assert (encapsulation_key, decapsulation_key) == plain.keygen(d, z)
+shared_secret, cipher = cached.encapsulation(m, encapsulation_key)
+assert (shared_secret, cipher) == plain.encapsulation(m, encapsulation_key)
+assert cached.decapsulation(cipher, decapsulation_key) == shared_secret
+assert cache.stats()['entries'] == 1 and cache.stats()['hits'] == 2
+
+# Shared between threads
+with ThreadPoolExecutor(8) as pool:
+    results = list(pool.map(lambda _: MLKEM_(const, matrix_cache=cache).encapsulation(m, encapsulation_key),
+                            range(32)))
+assert all(result == (shared_secret, cipher) for result in results)
+assert cache.stats()['hits'] == 34
+
+print(f'MatrixCache: {cache.stats()}')
@@ -0,0 +1,57 @@
+from Crypto.Random import get_random_bytes
+
+import core.constants.dsa44 as dsa_const
+import core.constants.kem768 as kem_const
+from core.subroutines.MLDSA_ import MLDSA_
+from core.subroutines.MLKEM_ import MLKEM_
+
+ml_kem = MLKEM_(kem_const)
+encapsulation_key, decapsulation_key = ml_kem.keygen(get_random_bytes(32), get_random_bytes(32))
+expanded_encapsulation_key = ml_kem.expand_encapsulation_key(encapsulation_key)
+
+m = get_random_bytes(32)
+shared_secret, cipher = ml_kem.encapsulation(m, expanded_encapsulation_key)
+assert (shared_secret, cipher) == ml_kem.encapsulation(m, encapsulation_key), 'expanded encapsulation key differs'
+assert ml_kem.decapsulation(cipher, decapsulation_key) == shared_secret
+
+expanded_decapsulation_key = ml_kem.expand_decapsulation_key(decapsulation_key)
+bad_cipher = bytes([cipher[0] ^ 1]) + cipher[1:]
+assert ml_kem.decapsulation(cipher, expanded_decapsulation_key) == shared_secret, 'expanded decapsulation key differs'
+assert ml_kem.decapsulation(bad_cipher, expanded_decapsulation_key) == ml_kem.decapsulation(bad_cipher,
+                                                                                             decapsulation_key)
+
+print('expanded ML-KEM keys match raw keys')
+
+ml_dsa = MLDSA_(dsa_const)
+public_key, private_key = ml_dsa.keygen(get_random_bytes(32))
+expanded_signing_key = ml_dsa.expand_signing_key(private_key)
+
+message, randomness = [1, 0, 0], get_random_bytes(32)
+assert ml_dsa.sign(expanded_signing_key, message, randomness) == ml_dsa.sign(private_key, message, randomness), \
+    'expanded signing key differs'
+signature = ml_dsa.sign(expanded_signing_key, message, randomness)
+
+expanded_verification_key = ml_dsa.expand_verification_key(public_key)
+assert ml_dsa.verify(expanded_verification_key, message, signature), 'signature does not verify'
+assert ml_dsa.verify(public_key, message, signature), 'signature does not verify with the raw key'
+assert not ml_dsa.verify(expanded_verification_key, [1, 1, 0], signature), 'signature verifies another message'
+
+print('expanded ML-DSA keys match raw keys')
+
+messages = []
+logged_dsa = MLDSA_(dsa_const, log=messages.append)
+assert logged_dsa.sign(expanded_signing_key, message, randomness) == signature, 'logging changes the signature'
+rejections = logged_dsa.rejection_stats()
+assert set(rejections) == set(MLDSA_.REJECTION_REASONS)
+assert sum(rejections.values()) == sum(m.startswith('attempt rejected') for m in messages), 'rejections are not logged'
+assert any(m.startswith('successful after') for m in messages)
+
+print('ML-DSA signing reports rejections through the log callback')
+
+for attempts in (2, 5):
+    speculative_dsa = MLDSA_(dsa_const, parallel_attempts=attempts)
+    assert speculative_dsa.sign(expanded_signing_key, message, randomness) == signature, \
+        f'speculative signing with {attempts} attempts differs'
+    assert speculative_dsa.rejection_stats() == rejections, 'speculative signing counts other rejections'
+
+print('speculative ML-DSA signing matches sequential signing')
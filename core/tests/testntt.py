@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+
+import core.constants.kem768 as const
+import core.constants.dsa44 as dsa_const
+from core.utils.arithmetic import MONTGOMERY
+from core.utils.ntt import NTT, ArrayNTT
+from core.utils.overflow.stubborn import NTTModified, VectorNTT
+
+ntt = NTT(const)
+array_ntt = ArrayNTT(const)
+
+vector = [[random.randrange(const.Q) for _ in range(256)] for _ in range(const.K)]
+vector_cap = array_ntt.ntt(vector)
+
+assert vector_cap.tolist() == [ntt.ntt(f) for f in vector], 'forward NTT differs'
+assert array_ntt.ntt_inverse(vector_cap).tolist() == [ntt.ntt_inverse(f) for f in vector_cap.tolist()], \
+    'inverse NTT differs'
+assert array_ntt.ntt_inverse(vector_cap).tolist() == vector, 'inverse NTT is not a round trip'
+assert np.array_equal(array_ntt.multiply_ntt(vector_cap, vector_cap[::-1]),
+                      [ntt.multiply_ntt(f, g) for f, g in zip(vector_cap.tolist(), vector_cap[::-1].tolist())])
+
+montgomery_ntt = ArrayNTT(const, MONTGOMERY)
+assert np.array_equal(montgomery_ntt.ntt(vector), vector_cap), 'montgomery forward NTT differs'
+assert np.array_equal(montgomery_ntt.ntt_inverse(vector_cap), vector), 'montgomery inverse NTT differs'
+
+print('ArrayNTT matches NTT')
+
+for _ in range(200):
+    seed = random.randbytes(34)
+    assert array_ntt.get_sample_ntt(seed).tolist() == ntt.get_sample_ntt(seed), 'sampled polynomial differs'
+ro = random.randbytes(32)
+matrix = array_ntt.get_sample_ntt_matrix(ro, const.K)
+assert all(matrix[i][j].tolist() == ntt.get_sample_ntt(ro + j.to_bytes() + i.to_bytes())
+           for i in range(const.K) for j in range(const.K)), 'sampled matrix differs'
+
+for eta in (2, 3):
+    byte_arrays = [random.randbytes(64 * eta) for _ in range(2 * const.K + 1)]
+    assert array_ntt.get_sample_polyCBD_batch(byte_arrays, eta).tolist() == \
+        [ntt.get_sample_polyCBD(byte_array, eta) for byte_array in byte_arrays], 'CBD sampling differs'
+
+print('ArrayNTT sampling matches NTT')
+
+f = [random.randrange(dsa_const.Q) for _ in range(256)]
+g = [random.randrange(dsa_const.Q) for _ in range(256)]
+product = [0] * 256
+for i in range(256):
+    for j in range(256):
+        sign = 1 if i + j < 256 else -1
+        product[(i + j) % 256] = (product[(i + j) % 256] + sign * f[i] * g[j]) % dsa_const.Q
+
+assert (NTTModified(dsa_const, f).ntt() * NTTModified(dsa_const, g).ntt()).inverse().polynomial.tolist() == product, \
+    'NTTModified product is not the negacyclic convolution'
+
+vector = VectorNTT(dsa_const, [NTTModified(dsa_const, f), NTTModified(dsa_const, g)])
+assert vector.ntt().inverse() == vector, 'VectorNTT inverse is not a round trip'
+assert vector.ntt()[1] == NTTModified(dsa_const, g).ntt(), 'VectorNTT rows differ from NTTModified'
+assert vector.ntt(MONTGOMERY) == vector.ntt(), 'montgomery VectorNTT differs'
+assert vector.ntt().inverse(MONTGOMERY) == vector, 'montgomery VectorNTT inverse differs'
+
+print('VectorNTT matches NTTModified')
@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+
+import core.constants.dsa44 as const
+from core.utils.optimizers import (mod_symmetric, power2_round, decompose, high_bits, low_bits, make_hint, use_hint,
+                                   mod_symmetric_array, power2_round_array, decompose_array, high_bits_array,
+                                   low_bits_array, make_hint_array, use_hint_array)
+from core.utils.overflow.stubborn import VectorNTT
+
+Q, GAMMA_2 = const.Q, const.GAMMA_2
+
+# random values plus the edges of the decompose corner case r - r0 = Q - 1
+r = [random.randrange(Q) for _ in range(10000)] + [0, 1, GAMMA_2, 2 * GAMMA_2] + list(range(Q - GAMMA_2 - 2, Q))
+z = [random.randrange(Q) for _ in r]
+h = [random.randrange(2) for _ in r]
+r_array, z_array, h_array = np.array(r), np.array(z), np.array(h)
+
+for a in (7, 2 ** const.D, 2 * GAMMA_2, Q):
+    m = [random.randrange(-3 * Q, 3 * Q) for _ in range(1000)]
+    assert mod_symmetric_array(np.array(m), a).tolist() == [mod_symmetric(x, a) for x in m], 'mod_symmetric differs'
+
+assert np.array(power2_round_array(r_array, Q, const.D)).T.tolist() == [list(power2_round(x, Q, const.D)) for x in r], \
+    'power2_round differs'
+assert np.array(decompose_array(r_array, Q, GAMMA_2)).T.tolist() == [list(decompose(x, Q, GAMMA_2)) for x in r], \
+    'decompose differs'
+assert high_bits_array(r_array, Q, GAMMA_2).tolist() == [high_bits(x, Q, GAMMA_2) for x in r], 'high_bits differs'
+assert low_bits_array(r_array, Q, GAMMA_2).tolist() == [low_bits(x, Q, GAMMA_2) for x in r], 'low_bits differs'
+assert make_hint_array(z_array, r_array, Q, GAMMA_2).tolist() == [make_hint(x, y, Q, GAMMA_2) for x, y in zip(z, r)], \
+    'make_hint differs'
+assert use_hint_array(h_array, r_array, Q, GAMMA_2).tolist() == [use_hint(x, y, Q, GAMMA_2) for x, y in zip(h, r)], \
+    'use_hint differs'
+
+w = VectorNTT(const, r_array[:const.K * 256].reshape(const.K, 256))
+hint = VectorNTT(const, h_array[:const.K * 256].reshape(const.K, 256))
+assert w.apply(high_bits, Q, GAMMA_2).to_list() == [[high_bits(x, Q, GAMMA_2) for x in row] for row in w.to_list()]
+assert hint.apply(use_hint, Q, GAMMA_2, other=w).to_list() == \
+    [[use_hint(x, y, Q, GAMMA_2) for x, y in zip(*rows)] for rows in zip(hint.to_list(), w.to_list())]
+
+print('array kernels match the scalar functions')
@@ -0,0 +1,101 @@
+import random
+from types import SimpleNamespace
+
+from Crypto.Hash import SHAKE128, SHAKE256
+
+import core.constants.dsa44 as const
+from core.utils.advbits import bit_unpack
+from core.utils.bits import int_to_bytes, bytes_to_bits, coeff_from_three_bytes, coeff_from_half_byte
+from core.utils.dsa.sampling import Sample
+from core.utils.hash import shake256_reader
+from core.utils.overflow.stubborn import VectorNTT
+
+
+def reference_rej_ntt_polynomial(seed):
+    shake_128 = SHAKE128.new(seed)
+    a_cap = []
+    while len(a_cap) < 256:
+        s = shake_128.read(3)
+        coefficient = coeff_from_three_bytes(s[0].to_bytes(), s[1].to_bytes(), s[2].to_bytes())
+        if coefficient is not None:
+            a_cap.append(coefficient)
+    return a_cap
+
+
+sample = Sample(const)
+
+for _ in range(100):
+    seed = random.randbytes(34)
+    assert sample.rej_ntt_polynomial(seed).polynomial.tolist() == reference_rej_ntt_polynomial(seed), \
+        'rej_ntt_polynomial differs'
+
+seed = random.randbytes(32)
+matrix_vector = sample.expand_A(seed)
+assert sample.expand_A_array(seed).shape == (const.K, const.L, 256)
+for i in range(const.K):
+    for j in range(const.L):
+        assert matrix_vector[i][j].polynomial.tolist() == reference_rej_ntt_polynomial(seed + bytes([j, i])), \
+            'expand_A differs'
+
+print('rejection sampling matches the byte wise sampler')
+
+
+def reference_rej_bounded_polynomial(seed, eta):
+    shake_256 = SHAKE256.new(seed)
+    a = []
+    while len(a) < 256:
+        z = int.from_bytes(shake_256.read(1))
+        for z_ in (coeff_from_half_byte(z % 16, eta), coeff_from_half_byte(z // 16, eta)):
+            if z_ is not None and len(a) < 256:
+                a.append(z_)
+    return a
+
+
+eta4_const = SimpleNamespace(**{name: getattr(const, name) for name in dir(const) if name.isupper()})
+eta4_const.ETA = 4
+
+for config in (const, eta4_const):
+    bounded_sample = Sample(config)
+    for _ in range(100):
+        seed = random.randbytes(66)
+        assert bounded_sample.rej_bounded_polynomial(seed).polynomial.tolist() == \
+            reference_rej_bounded_polynomial(seed, config.ETA), 'rej_bounded_polynomial differs'
+
+seed = random.randbytes(64)
+s1, s2 = sample.expand_S(seed)
+assert s1.to_list() + s2.to_list() == [reference_rej_bounded_polynomial(seed + int_to_bytes(i, 2), const.ETA)
+                                       for i in range(const.L + const.K)], 'expand_S differs'
+
+c = 1 + (const.GAMMA_1 - 1).bit_length()
+y = sample.expand_mask(seed, const.L)
+assert y == VectorNTT(const, [bit_unpack(SHAKE256.new(seed + int_to_bytes(i + const.L, 2)).read(32 * c),
+                                         const.GAMMA_1 - 1, const.GAMMA_1) for i in range(const.L)]), \
+    'expand_mask differs'
+
+print('bounded and mask sampling match the byte wise sampler')
+
+
+def reference_sample_in_ball(seed):
+    sample_c = [0] * 256
+    shake_256 = SHAKE256.new(seed)
+    h = bytes_to_bits(shake_256.read(8))
+    for i in range(256 - const.TO, 256):
+        j = int.from_bytes(shake_256.read(1))
+        while j > i:
+            j = int.from_bytes(shake_256.read(1))
+        sample_c[i] = sample_c[j]
+        sample_c[j] = -1 if h[i + const.TO - 256] else 1
+    return sample_c
+
+
+for _ in range(100):
+    seed = random.randbytes(const.LAMBDA // 4)
+    assert sample.sample_in_ball(seed).polynomial.tolist() == reference_sample_in_ball(seed), 'sample_in_ball differs'
+
+seed = random.randbytes(32)
+reader, shake_256 = shake256_reader(seed), SHAKE256.new(seed)
+for length in (1, 0, 135, 2, 300, 1, 136):
+    assert reader.read(length) == shake_256.read(length), 'XOFReader.read differs'
+    assert reader.read_byte() == shake_256.read(1)[0], 'XOFReader.read_byte differs'
+
+print('sample_in_ball matches the byte wise sampler')
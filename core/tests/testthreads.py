@@ -0,0 +1,79 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import core.constants.dsa44 as dsa44
+import core.constants.kem768 as kem768
+from core.algorithms.MLKEM import MLKEM
+from core.subroutines.KPke import KPke
+from core.subroutines.MLDSA_ import MLDSA_
+from core.subroutines.MLKEM_ import MLKEM_
+from core.utils.cache import MatrixCache
+
+THREADS = 8
+JOBS = 64
+
+# a KPke instance no longer remembers its first key pair
+kpke = KPke(kem768)
+d1, d2 = random.randbytes(32), random.randbytes(32)
+assert kpke.keygen(d1) != kpke.keygen(d2)
+assert kpke.keygen(d1) == KPke(kem768).keygen(d1)
+
+for arithmetic in (None, 'montgomery'):
+    shared = MLKEM_(kem768, arithmetic, MatrixCache(max_entries=4))
+    seeds = [(random.randbytes(32), random.randbytes(32)) for _ in range(JOBS)]
+    ms = [random.randbytes(32) for _ in range(JOBS)]
+    expected_keys = [MLKEM_(kem768, arithmetic).keygen(d, z) for d, z in seeds]
+    expected_secrets = [MLKEM_(kem768, arithmetic).encapsulation(m, keys[0])
+                        for m, keys in zip(ms, expected_keys)]
+
+    def kem_round_trip(job):
+        encapsulation_key, decapsulation_key = shared.keygen(*seeds[job])
+        shared_secret, cipher = shared.encapsulation(ms[job], encapsulation_key)
+        return (encapsulation_key, decapsulation_key), (shared_secret, cipher), shared.decapsulation(
+            cipher, decapsulation_key)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(kem_round_trip, range(JOBS)))
+    assert [keys for keys, _, _ in results] == expected_keys, f'threaded key generation differs for {arithmetic}'
+    assert [secrets for _, secrets, _ in results] == expected_secrets, f'threaded encapsulation differs for {arithmetic}'
+    assert all(secret == shared_secret for _, (secret, _), shared_secret in results)
+
+ml_kem = MLKEM(MLKEM.MLKEM768)
+peers = [ml_kem.key_gen() for _ in range(4)]
+
+
+def kem_wrapper(job):
+    encapsulation_key, decapsulation_key = peers[job % len(peers)]
+    shared_secret, cipher = ml_kem.encapsulation(encapsulation_key)
+    return shared_secret == ml_kem.decapsulation(decapsulation_key, cipher)
+
+
+with ThreadPoolExecutor(THREADS) as pool:
+    assert all(pool.map(kem_wrapper, range(JOBS))), 'a shared MLKEM lost a shared secret'
+
+print('one ML-KEM engine serves many threads')
+
+ml_dsa = MLDSA_(dsa44)
+key_pairs = [ml_dsa.keygen(random.randbytes(32)) for _ in range(4)]
+jobs = [(key_pairs[i % len(key_pairs)], [random.randrange(2) for _ in range(32)], random.randbytes(32))
+        for i in range(JOBS // 2)]
+reference = MLDSA_(dsa44)
+expected = [reference.sign(private_key, message, rnd) for (_, private_key), message, rnd in jobs]
+
+
+def dsa_round_trip(job):
+    (public_key, private_key), message, rnd = jobs[job]
+    signature = ml_dsa.sign(private_key, message, rnd)
+    return signature, ml_dsa.verify(public_key, message, signature), ml_dsa.verify(public_key, message[1:], signature)
+
+
+before = ml_dsa.rejection_stats()
+with ThreadPoolExecutor(THREADS) as pool:
+    results = list(pool.map(dsa_round_trip, range(len(jobs))))
+assert [signature for signature, _, _ in results] == expected, 'threaded signing differs'
+assert all(valid and not forged for _, valid, forged in results)
+after = ml_dsa.rejection_stats()
+# every rejection of every thread is counted exactly once
+assert {reason: after[reason] - before[reason] for reason in after} == reference.rejection_stats()
+
+print('one ML-DSA engine serves many threads')
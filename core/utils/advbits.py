@@ -1,19 +1,55 @@
-from core.utils.bits import int_to_bits, bits_to_bytes, bytes_to_bits, bits_to_int
+import numpy as np
+
+from core.utils.bits import bits_to_bytes, bytes_to_bits
 from core.utils.overflow.stubborn import NTTModified, VectorNTT
 
 import core.constants.dsa44 as const
 
 
+def _coefficients(polynomial):
+    return polynomial.array if isinstance(polynomial, VectorNTT) else polynomial.polynomial
+
+
+def pack_bits(values, width):
+    """
+    Packs integers in [0, 2^width) into a byte string, width bits per value, least significant bit first
+
+    Args:
+        values: int64 array of shape (..., 256)
+        width: Number of bits per value
+
+    Returns:
+        bytes: A byte string of length 32*width per polynomial
+    """
+    bits = ((values[..., None] >> np.arange(width, dtype=np.int64)) & 1).astype(np.uint8)
+    return bits_to_bytes(bits.reshape(-1))
+
+
+def unpack_bits(byte_string, width):
+    """
+    Reverses pack_bits
+
+    Args:
+        byte_string: Byte string of length 32*width*k
+        width: Number of bits per value
+
+    Returns:
+        int64 array of shape (k, 256)
+    """
+    bits = bytes_to_bits(byte_string).reshape(-1, 256, width).astype(np.int64)
+    return bits @ (1 << np.arange(width, dtype=np.int64))
+
+
 def simple_bit_pack(polynomial, end):
     """
-    Encodes a polynomial into a byte string
+    Encodes a polynomial (or every polynomial of a vector) into a byte string
 
     Args:
-        polynomial: A list of coefficients in range [0,end]
+        polynomial: A NTTModified or VectorNTT with coefficients in range [0,end]
         end: A Natural Number
 
     Returns:
-        bytes: A byte string of length 32*bit_len(b)
+        bytes: A byte string of length 32*bit_len(b) per polynomial
     """
 
     if not polynomial.check(0, end):
@@ -21,11 +57,7 @@ def simple_bit_pack(polynomial, end):
     if not end > 0:
         raise ValueError("End should be greater than 0.")
 
-    z = ''
-    for i in range(256):
-        z += int_to_bits(polynomial[i], end.bit_length())
-
-    return bits_to_bytes([int(i) for i in z])
+    return pack_bits(_coefficients(polynomial), end.bit_length())
 
 
 def simple_bit_unpack(byte_string, end):
@@ -44,33 +76,44 @@ def simple_bit_unpack(byte_string, end):
     if not len(byte_string) == 32 * c:
         raise ValueError(f"Length of byte string should be {32 * c} not {len(byte_string)}")
 
-    z = bytes_to_bits(byte_string)
-    w = NTTModified(const)
-    for i in range(256):
-        w.polynomial[i] = (bits_to_int(''.join([str(z[i*c + j]) for j in range(c)]), c))
-    return w
+    return NTTModified(const, unpack_bits(byte_string, c)[0])
+
+
+def simple_bit_unpack_vector(byte_string, end):
+    """
+    Reverses the procedure simple_bit_pack for a whole vector
+
+    Args:
+        byte_string: Byte string of length 32*bit_len(end)*k
+        end: A Natural number
+
+    Returns:
+        VectorNTT: Newly created vector of k polynomials
+    """
+
+    c = end.bit_length()
+    if not len(byte_string) % (32 * c) == 0:
+        raise ValueError(f"Length of byte string should be a multiple of {32 * c} not {len(byte_string)}")
+
+    return VectorNTT(const, unpack_bits(byte_string, c))
 
 
 def bit_pack(polynomial, start, end):
     """
-    Encodes a polynomial into a byte string
+    Encodes a polynomial (or every polynomial of a vector) into a byte string
 
     Args:
-        polynomial: A NTTModified Object
+        polynomial: A NTTModified or VectorNTT Object
         start: Starting coefficient > 0
         end: Ending Coefficient > start
 
     Returns:
-        bytes: A byte string of length 32*bit_len(b)
+        bytes: A byte string of length 32*bit_len(b) per polynomial
     """
     if not polynomial.check(-start, end):
         raise ValueError("All Coefficients should be in range [0, end].")
 
-    z = ''
-    for i in range(256):
-        z += int_to_bits(end - polynomial[i], (start + end).bit_length())
-
-    return bits_to_bytes([int(i) for i in z])
+    return pack_bits(end - _coefficients(polynomial), (start + end).bit_length())
 
 
 def bit_unpack(byte_string, start, end):
@@ -89,11 +132,26 @@ def bit_unpack(byte_string, start, end):
     if not len(byte_string) == 32 * c:
         raise ValueError(f"Length of byte string should be {32 * c} not {len(byte_string)}")
 
-    z = bytes_to_bits(byte_string)
-    w = NTTModified(const)
-    for i in range(256):
-        w.polynomial[i] = (end - bits_to_int(''.join([str(z[i * c + j]) for j in range(c)]), c))
-    return w
+    return NTTModified(const, end - unpack_bits(byte_string, c)[0])
+
+
+def bit_unpack_vector(byte_string, start, end):
+    """
+    Reverses the procedure bit_pack for a whole vector
+
+    Args:
+        byte_string: Byte string of length 32*bit_len(end)*k
+        start: Starting coefficient > 0
+        end: Ending Coefficient > start
+
+    Returns:
+        VectorNTT: Newly created vector of k polynomials
+    """
+    c = (start + end).bit_length()
+    if not len(byte_string) % (32 * c) == 0:
+        raise ValueError(f"Length of byte string should be a multiple of {32 * c} not {len(byte_string)}")
+
+    return VectorNTT(const, end - unpack_bits(byte_string, c))
 
 
 def hint_bit_pack(polynomial_vector, K, OMEGA):
@@ -1,16 +1,28 @@
 from typing import List, Optional
+
+import numpy as np
 from core.utils.overflow.stubborn import NTTModified, VectorNTT
 
 Matrix = VectorNTT
 
-def simple_bit_pack(polynomial: NTTModified, end: int) -> bytes: ...
+def _coefficients(polynomial: NTTModified | VectorNTT) -> np.ndarray: ...
+
+def pack_bits(values: np.ndarray, width: int) -> bytes: ...
+
+def unpack_bits(byte_string: bytes, width: int) -> np.ndarray: ...
+
+def simple_bit_pack(polynomial: NTTModified | VectorNTT, end: int) -> bytes: ...
 
 def simple_bit_unpack(byte_string: bytes, end: int) -> NTTModified: ...
 
-def bit_pack(polynomial: NTTModified, start: int, end: int) -> bytes: ...
+def simple_bit_unpack_vector(byte_string: bytes, end: int) -> VectorNTT: ...
+
+def bit_pack(polynomial: NTTModified | VectorNTT, start: int, end: int) -> bytes: ...
 
 def bit_unpack(byte_string: bytes, start: int, end: int) -> NTTModified: ...
 
+def bit_unpack_vector(byte_string: bytes, start: int, end: int) -> VectorNTT: ...
+
 def hint_bit_pack(polynomial_vector: Matrix, K: int, OMEGA: int) -> bytes: ...
 
 def hint_bit_unpack(byte_string: bytes, K: int, OMEGA: int) -> Matrix | None: ...
@@ -0,0 +1,163 @@
+from functools import lru_cache
+
+import numpy as np
+
+EAGER = 'eager'
+MONTGOMERY = 'montgomery'
+
+
+class ModularArithmetic:
+    """
+    Runs the NTT butterflies on int64 arrays of shape (..., 256), one whole layer per array operation.
+    Every addition, subtraction and multiplication is reduced modulo q right away and the inverse
+    transform ends with a separate scaling pass.
+
+    Attributes:
+        q: Modulus
+        zetas: bit reversed zeta values as an int64 array
+        scale_factor: inverse of the transform size modulo q
+    """
+    mode = EAGER
+
+    def __init__(self, q, zeta_values, scale_factor):
+        self.q = q
+        self.zetas = np.array(zeta_values, dtype=np.int64)
+        self.scale_factor = scale_factor
+
+    def reduce(self, a):
+        """
+        Reduces every element of a to the range [0, q)
+        """
+        return a % self.q
+
+    def ntt(self, f, min_length):
+        """
+        Computes the forward NTT with Cooley-Tukey butterflies.
+
+        Args:
+            f: int64 array of shape (..., 256), transformed in place
+            min_length: Length of the last layer (2 for ML-KEM, 1 for ML-DSA)
+
+        Returns:
+            The same array f holding the NTT coefficients in [0, q)
+        """
+        shape = f.shape
+        length = 128
+        while length >= min_length:
+            blocks = 128 // length
+            layer = f.reshape(*shape[:-1], blocks, 2, length)
+            zeta = self.zetas[blocks: 2 * blocks, None]
+            t = self.reduce(zeta * layer[..., 1, :])
+            layer[..., 1, :] = self.reduce(layer[..., 0, :] - t)
+            layer[..., 0, :] = self.reduce(layer[..., 0, :] + t)
+            length //= 2
+        return f
+
+    def ntt_inverse(self, f, min_length):
+        """
+        Computes the inverse NTT with Gentleman-Sande butterflies, scaled by the inverse of the transform size.
+
+        Args:
+            f: int64 array of shape (..., 256), transformed in place
+            min_length: Length of the first layer (2 for ML-KEM, 1 for ML-DSA)
+
+        Returns:
+            The polynomial coefficients in [0, q)
+        """
+        shape = f.shape
+        length = min_length
+        while length <= 128:
+            blocks = 128 // length
+            layer = f.reshape(*shape[:-1], blocks, 2, length)
+            zeta = self.zetas[2 * blocks - 1: blocks - 1: -1, None]
+            t = layer[..., 0, :].copy()
+            layer[..., 0, :] = self.reduce(t + layer[..., 1, :])
+            layer[..., 1, :] = self.reduce(zeta * (layer[..., 1, :] - t))
+            length *= 2
+        return self.reduce(f * self.scale_factor)
+
+
+class MontgomeryArithmetic(ModularArithmetic):
+    """
+    Lazy reduction variant of ModularArithmetic. Twiddles are kept in Montgomery form (zeta * 2^32 mod q),
+    so only the products are reduced with a Montgomery reduction and sums and differences may grow between
+    layers. The inverse scale is folded into the twiddles of the last layer. Both transforms end with one
+    canonical reduction, so the outputs are identical to the eager ones.
+    """
+    mode = MONTGOMERY
+    R_BITS = 32
+
+    def __init__(self, q, zeta_values, scale_factor):
+        super().__init__(q, zeta_values, scale_factor)
+        r = 1 << self.R_BITS
+        self.q_inverse = np.uint64(pow(q, -1, r))
+        self.mask = np.uint64(r - 1)
+        self.zetas_montgomery = (self.zetas << self.R_BITS) % q
+        self.scale_montgomery = (scale_factor << self.R_BITS) % q
+        self.zetas_scaled_montgomery = ((self.zetas * scale_factor % q) << self.R_BITS) % q
+
+    def montgomery_reduce(self, a):
+        """
+        Computes a * 2^-32 mod q for every element of a, for |a| < 2^62.
+
+        Returns:
+            An array congruent to a * 2^-32 with elements in the range (a / 2^32 - q, a / 2^32)
+        """
+        m = ((a.astype(np.uint64) & self.mask) * self.q_inverse) & self.mask
+        return (a - m.astype(np.int64) * self.q) >> self.R_BITS
+
+    def ntt(self, f, min_length):
+        shape = f.shape
+        length = 128
+        while length >= min_length:
+            blocks = 128 // length
+            layer = f.reshape(*shape[:-1], blocks, 2, length)
+            zeta = self.zetas_montgomery[blocks: 2 * blocks, None]
+            t = self.montgomery_reduce(zeta * layer[..., 1, :])
+            layer[..., 1, :] = layer[..., 0, :] - t
+            layer[..., 0, :] += t
+            length //= 2
+        return self.reduce(f)
+
+    def ntt_inverse(self, f, min_length):
+        shape = f.shape
+        length = min_length
+        while length <= 128:
+            blocks = 128 // length
+            layer = f.reshape(*shape[:-1], blocks, 2, length)
+            t = layer[..., 0, :].copy()
+            if length < 128:
+                zeta = self.zetas_montgomery[2 * blocks - 1: blocks - 1: -1, None]
+                layer[..., 0, :] = t + layer[..., 1, :]
+            else:
+                zeta = self.zetas_scaled_montgomery[1: 0: -1, None]
+                layer[..., 0, :] = self.montgomery_reduce(self.scale_montgomery * (t + layer[..., 1, :]))
+            layer[..., 1, :] = self.montgomery_reduce(zeta * (layer[..., 1, :] - t))
+            length *= 2
+        return self.reduce(f)
+
+
+ARITHMETICS = {
+    EAGER: ModularArithmetic,
+    MONTGOMERY: MontgomeryArithmetic,
+}
+
+
+@lru_cache
+def get_arithmetic(mode, q, zeta_values, scale_factor):
+    """
+    Returns a shared arithmetic object for a parameter set
+
+    Args:
+        mode: EAGER or MONTGOMERY (None selects EAGER)
+        q: Modulus
+        zeta_values: Tuple of bit reversed zeta values
+        scale_factor: inverse of the transform size modulo q
+
+    Returns:
+        ModularArithmetic: arithmetic object (built once per arguments)
+    """
+    mode = mode or EAGER
+    if mode not in ARITHMETICS:
+        raise ValueError(f"Unknown arithmetic mode {mode}. Use one of {list(ARITHMETICS)}")
+    return ARITHMETICS[mode](q, tuple(zeta_values), scale_factor)
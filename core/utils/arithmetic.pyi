@@ -0,0 +1,37 @@
+from typing import Any, Dict, Optional, Tuple, Type
+
+import numpy as np
+
+EAGER: str
+MONTGOMERY: str
+
+
+class ModularArithmetic:
+    mode: str
+    q: int
+    zetas: np.ndarray
+    scale_factor: int
+
+    def __init__(self, q: int, zeta_values: Tuple[int, ...], scale_factor: int) -> None: ...
+
+    def reduce(self, a: np.ndarray) -> np.ndarray: ...
+
+    def ntt(self, f: np.ndarray, min_length: int) -> np.ndarray: ...
+
+    def ntt_inverse(self, f: np.ndarray, min_length: int) -> np.ndarray: ...
+
+
+class MontgomeryArithmetic(ModularArithmetic):
+    R_BITS: int
+    q_inverse: np.uint64
+    mask: np.uint64
+    zetas_montgomery: np.ndarray
+    scale_montgomery: int
+    zetas_scaled_montgomery: np.ndarray
+
+    def montgomery_reduce(self, a: np.ndarray) -> np.ndarray: ...
+
+
+ARITHMETICS: Dict[str, Type[ModularArithmetic]]
+
+def get_arithmetic(mode: Optional[str], q: int, zeta_values: Tuple[int, ...], scale_factor: int) -> ModularArithmetic: ...
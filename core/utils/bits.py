@@ -1,3 +1,5 @@
+import numpy as np
+
 import core.constants_ as const
 from numpy import array, floor
 
@@ -7,7 +9,7 @@ def bits_to_bytes(bit_array):
     Converts a bit array of length (multiple of 8) into a byte array.
 
     Args:
-        bit_array: List of bits (0 or 1) with length 8 * l.
+        bit_array: Array or list of bits (0 or 1) with length 8 * l, least significant bit first.
 
     Returns:
         Byte array of length l.
@@ -15,13 +17,7 @@ def bits_to_bytes(bit_array):
     if len(bit_array) % 8 != 0:
         raise ValueError("Bit array length must be a multiple of 8.")
 
-    byte_array = bytearray(len(bit_array) // 8)
-    for i in range(len(bit_array)):
-        byte_index = i // 8
-        bit_position = i % 8
-        byte_array[byte_index] += bit_array[i] * (1 << bit_position)
-
-    return bytes(byte_array)
+    return np.packbits(np.asarray(bit_array, dtype=np.uint8), bitorder='little').tobytes()
 
 
 def bytes_to_bits(byte_array):
@@ -29,44 +25,34 @@ def bytes_to_bits(byte_array):
     Converts a byte array into a bit array.
 
     Args:
-        byte_array: Byte array of length l
+        byte_array: Byte array (or any buffer) of length l
 
     Returns:
-        Bit array of length 8 * l.
+        uint8 array of 8 * l bits, least significant bit first.
 
     """
-    bit_array = []
-    for byte in byte_array:
-        for _ in range(8):
-            bit_array.append(byte % 2)
-            byte //= 2
-
-    return bit_array
+    return np.unpackbits(np.frombuffer(byte_array, dtype=np.uint8), bitorder='little')
 
 
 def byte_encode(f, d):
     """
-    Encodes an array of d-bit integers into a byte array.
+    Encodes an array of d-bit integers into a byte array. A whole (k, 256) vector is encoded in one call
+    and gives the concatenation of the encodings of its polynomials.
 
     Args:
-        f: Array of integers.
+        f: Array of integers of shape (256,) or (..., 256).
         d: Bit-length of the integers (1 <= d <= 12).
 
     Returns:
-        Encoded byte array.
+        Encoded byte array of length 32 * d per polynomial.
     """
     if not (1 <= d <= 12):
         raise ValueError("d must be between 1 and 12.")
-    assert len(f) == 256, f"Int array must be of length {256}. Not {len(f)} "
+    f = np.asarray(f, dtype=np.int64)
+    assert f.shape[-1] == 256, f"Int array must be of length {256}. Not {f.shape[-1]} "
 
-    b = [0] * (256 * d)
-    for i in range(256):
-        a = f[i]
-        for j in range(d):
-            b[i * d + j] = a % 2
-            a = (a - b[i * d + j]) // 2
-    byte_array = bits_to_bytes(b)
-    return byte_array
+    b = ((f[..., None] >> np.arange(d)) & 1).astype(np.uint8)
+    return bits_to_bytes(b.reshape(-1))
 
 
 def byte_decode(byte_array, d):
@@ -78,23 +64,34 @@ def byte_decode(byte_array, d):
         d: Bit-length of the integers (1 <= d <= 12).
 
     Returns:
-        Array of integers F.
+        Array of integers F of shape (256,).
     """
     if not (1 <= d <= 12):
         raise ValueError("d must be between 1 and 12.")
     assert len(byte_array) == 32 * d, f"The byte array must be of length {32 * d}. Not {len(byte_array)}."
 
-    bit_array = bytes_to_bits(byte_array)
+    return byte_decode_vector(byte_array, d)[0]
 
-    f = [0] * 256
 
-    for i in range(256):
-        for j in range(d):
-            f[i] += bit_array[i * d + j] * (2 ** j)
-        m = (2 ** d) if d < 12 else const.Q
-        f[i] %= m
+def byte_decode_vector(byte_array, d):
+    """
+    Decodes the concatenated encodings of k polynomials in one call.
 
-    return f
+    Args:
+        byte_array: Byte array of length 32 * d * k.
+        d: Bit-length of the integers (1 <= d <= 12).
+
+    Returns:
+        Array of integers of shape (k, 256).
+    """
+    if not (1 <= d <= 12):
+        raise ValueError("d must be between 1 and 12.")
+    assert len(byte_array) % (32 * d) == 0, f"The byte array must be a multiple of {32 * d}. Not {len(byte_array)}."
+
+    bits = bytes_to_bits(byte_array)
+    f = bits.reshape(-1, 256, d).astype(np.int64) @ (1 << np.arange(d, dtype=np.int64))
+    m = (2 ** d) if d < 12 else const.Q
+    return f % m
 
 
 def compress(x, d, q=3329):
@@ -225,6 +222,21 @@ def coeff_from_three_bytes(b0, b1, b2, q=8380417):
     return integer if integer < q else None  # Reject Sampling
 
 
+def coeffs_from_three_bytes(byte_string):
+    """
+    Splits a byte string into 23 bit candidates, the array counterpart of coeff_from_three_bytes
+    without the rejection step
+
+    Args:
+        byte_string: bytes whose length is a multiple of 3
+
+    Returns:
+        np.ndarray: int64 array of 2^16.(b2 mod 128) + 2^8.b1 + b0 for every 3 bytes
+    """
+    b = np.frombuffer(byte_string, dtype=np.uint8).reshape(-1, 3).astype(np.int64)
+    return ((b[:, 2] & 127) << 16) | (b[:, 1] << 8) | b[:, 0]
+
+
 def coeff_from_half_byte(b, ETA):
     """
     Let eta ∈ {2, 4}. Generates an element of {−eta, −eta + 1, ... , eta} or None
@@ -244,3 +256,34 @@ def coeff_from_half_byte(b, ETA):
         return 4 - b
 
     return None
+
+
+def half_bytes(byte_string):
+    """
+    Splits a byte string into its half bytes, the low half of every byte first
+
+    Args:
+        byte_string: bytes
+
+    Returns:
+        np.ndarray: int64 array of 2 * len(byte_string) values in range(0, 16)
+    """
+    b = np.frombuffer(byte_string, dtype=np.uint8).astype(np.int64)
+    return np.stack((b & 15, b >> 4), axis=1).reshape(-1)
+
+
+def coeffs_from_half_bytes(b, ETA):
+    """
+    Array counterpart of coeff_from_half_byte for half bytes that passed the rejection step
+    (b < 15 for eta 2 and b < 9 for eta 4)
+
+    Args:
+        b: int64 array of accepted half bytes
+        ETA: Constant for the algorithm
+
+    Returns:
+        np.ndarray: Integers b/w -eta to eta
+    """
+    if ETA == 2:
+        return 2 - (b % 5)
+    return 4 - b
@@ -1,12 +1,16 @@
 from typing import List, Optional
 
-def bits_to_bytes(bit_array: List[int]) -> bytes: ...
+import numpy as np
 
-def bytes_to_bits(byte_array: bytes) -> List[int]: ...
+def bits_to_bytes(bit_array: np.ndarray | List[int]) -> bytes: ...
 
-def byte_encode(f: List[int], d: int) -> bytes: ...
+def bytes_to_bits(byte_array: bytes | bytearray | memoryview) -> np.ndarray: ...
 
-def byte_decode(byte_array: bytes, d: int) -> List[int]: ...
+def byte_encode(f: np.ndarray | List[int], d: int) -> bytes: ...
+
+def byte_decode(byte_array: bytes, d: int) -> np.ndarray: ...
+
+def byte_decode_vector(byte_array: bytes, d: int) -> np.ndarray: ...
 
 def compress(x: List[int],d: int,q: Optional[int] = 3329) -> List[int]: ...
 
@@ -20,4 +24,10 @@ def int_to_bytes(integer: int, length: int) -> bytes: ...
 
 def coeff_from_three_bytes(b0: bytes, b1: bytes, b2: bytes, q:Optional[int] = 8380417) -> int | None: ...
 
+def coeffs_from_three_bytes(byte_string: bytes) -> np.ndarray: ...
+
 def coeff_from_half_byte(b: int, ETA: int) -> int | None: ...
+
+def half_bytes(byte_string: bytes) -> np.ndarray: ...
+
+def coeffs_from_half_bytes(b: np.ndarray, ETA: int) -> np.ndarray: ...
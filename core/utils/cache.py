@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+
+
+class MatrixCache:
+    """
+    A thread safe, size bounded LRU cache for expanded matrices (numpy arrays) keyed by their seed.
+    Share one instance between engines to skip resampling A for peers that come back often.
+
+    Attributes:
+        max_entries: Maximum number of matrices kept
+        max_bytes: Maximum total size of the kept matrices in bytes (None for no byte budget)
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that had to build the matrix
+    """
+    def __init__(self, max_entries=256, max_bytes=None):
+        if max_entries < 1:
+            raise ValueError("max_entries should be at least 1.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes should be positive or None.")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Looks up a matrix and marks it as most recently used
+
+        Args:
+            key: hashable key, e.g. (k, rho)
+
+        Returns:
+            The cached read only array, or None
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores a matrix, evicting the least recently used ones to stay within the bounds.
+        The array is made read only since it is shared between callers.
+
+        Args:
+            key: hashable key, e.g. (k, rho)
+            value: numpy array to store
+        """
+        value.setflags(write=False)
+        if self.max_bytes is not None and value.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.nbytes
+            self._entries[key] = value
+            self._size += value.nbytes
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and
+                                                            self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.nbytes
+
+    def get_or_create(self, key, factory):
+        """
+        Returns the cached matrix for key, building and storing it with factory() on a miss.
+        The factory runs outside the lock, so concurrent misses on the same key may both build it.
+
+        Args:
+            key: hashable key, e.g. (k, rho)
+            factory: callable returning the numpy array
+
+        Returns:
+            The read only array
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, bytes, hits and misses of the cache
+        """
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
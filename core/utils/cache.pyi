@@ -0,0 +1,31 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+
+
+class MatrixCache:
+    max_entries: int
+    max_bytes: Optional[int]
+    hits: int
+    misses: int
+    _size: int
+    _entries: OrderedDict
+    _lock: threading.Lock
+
+    def __init__(self, max_entries: int = 256, max_bytes: Optional[int] = None) -> None: ...
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]: ...
+
+    def put(self, key: Hashable, value: np.ndarray) -> None: ...
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], np.ndarray]) -> np.ndarray: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> Dict[str, int]: ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, key: Hashable) -> bool: ...
@@ -1,7 +1,11 @@
-from core.utils.advbits import simple_bit_pack, simple_bit_unpack, bit_pack, bit_unpack, hint_bit_pack, hint_bit_unpack
-from core.utils.overflow.stubborn import VectorNTT
+from core.utils.advbits import (simple_bit_pack, simple_bit_unpack_vector, bit_pack, bit_unpack_vector, hint_bit_pack,
+                                hint_bit_unpack)
 import logging
 
+import numpy as np
+
+from core.utils.overflow.stubborn import VectorNTT
+
 logging.basicConfig(level=logging.INFO)
 
 
@@ -33,14 +37,29 @@ class Encodings:
         if not len(seed) == 32:
             raise ValueError("Length of seed should be 32 bytes")
 
-        public_key = seed
-        length = self.const.N
-        for i in range(self.const.K):
-            public_key += simple_bit_pack(t1[i], length)
+        public_key = seed + simple_bit_pack(t1, self.const.N)
 
         assert len(public_key) == self.public_key_length, f"Length of public key should be {self.public_key_length}"
         return public_key
 
+    def public_key_encode_batch(self, seeds, t1):
+        """
+        Encodes N public keys, packing all the t1 vectors in one call
+
+        Args:
+            seeds: N byte strings of 32 bytes
+            t1: int64 array of shape (N, K, 256)
+
+        Returns:
+            List[bytes]: N encoded public keys, identical to public_key_encode
+        """
+        if not all(len(seed) == 32 for seed in seeds):
+            raise ValueError("Length of seed should be 32 bytes")
+
+        packed = simple_bit_pack(VectorNTT(self.const, t1), self.const.N)
+        length = self.public_key_length - 32
+        return [seed + packed[i * length: (i + 1) * length] for i, seed in enumerate(seeds)]
+
     def public_key_decode(self, public_key):
         """
         Reverse operation of public_key_encode
@@ -55,14 +74,7 @@ class Encodings:
             raise ValueError(f"Length of public key should be {self.public_key_length}")
 
         seed = public_key[:32]
-        signer_response = public_key[32:]
-        part_length = len(signer_response) // self.const.K
-        signer_response = [signer_response[i * part_length: (i + 1) * part_length] for i in
-                           range(self.const.K)]  # This is danger...
-        t1 = VectorNTT(self.const)
-
-        for i in range(self.const.K):
-            t1[i] = simple_bit_unpack(signer_response[i], self.const.N)
+        t1 = simple_bit_unpack_vector(public_key[32:], self.const.N)
         return seed, t1
 
     def private_key_encode(self, seed, k, tr, s1, s2, t0):
@@ -89,16 +101,45 @@ class Encodings:
             "[2 ^(D -1) + 1, 2^(D-1)]")
 
         private_key = seed + k + tr
-        for i in range(self.const.L):
-            private_key += bit_pack(s1[i], self.const.ETA, self.const.ETA)
-        for i in range(self.const.K):
-            private_key += bit_pack(s2[i], self.const.ETA, self.const.ETA)
-        for i in range(self.const.K):
-            private_key += bit_pack(t0[i], 2 ** (self.const.D - 1) - 1, 2 ** (self.const.D - 1))
+        private_key += bit_pack(s1, self.const.ETA, self.const.ETA)
+        private_key += bit_pack(s2, self.const.ETA, self.const.ETA)
+        private_key += bit_pack(t0, 2 ** (self.const.D - 1) - 1, 2 ** (self.const.D - 1))
 
         assert len(private_key) == self.private_key_length, f"We Fucked Up privately!! It is {self.private_key_length}"
         return private_key
 
+    def private_key_encode_batch(self, seeds, ks, trs, s1, s2, t0):
+        """
+        Encodes N private keys, packing every vector of the batch in one call
+
+        Args:
+            seeds: N byte strings of 32 bytes
+            ks: N byte strings of 32 bytes
+            trs: N byte strings of 64 bytes
+            s1: int64 array of shape (N, L, 256)
+            s2: int64 array of shape (N, K, 256)
+            t0: int64 array of shape (N, K, 256)
+
+        Returns:
+            List[bytes]: N encoded private keys, identical to private_key_encode
+        """
+        if not all(len(seed) == len(k) == len(tr) // 2 == 32 for seed, k, tr in zip(seeds, ks, trs)):
+            raise ValueError("Length of seed, k, tr should be 32 bytes")
+
+        s = VectorNTT(self.const, np.concatenate((s1, s2), axis=1))
+        t0 = VectorNTT(self.const, t0)
+        assert s.check(-self.const.ETA, self.const.ETA), "All Coefficients should be in range [-ETA, ETA]"
+        assert t0.check(-2 ** (self.const.D - 1) + 1, 2 ** (self.const.D - 1)), (
+            "All Coefficients should be in range"
+            "[2 ^(D -1) + 1, 2^(D-1)]")
+
+        packed_s = bit_pack(s, self.const.ETA, self.const.ETA)
+        packed_t0 = bit_pack(t0, 2 ** (self.const.D - 1) - 1, 2 ** (self.const.D - 1))
+        s_length = 32 * (2 * self.const.ETA).bit_length() * (self.const.L + self.const.K)
+        t0_length = 32 * self.const.D * self.const.K
+        return [seed + k + tr + packed_s[i * s_length: (i + 1) * s_length] +
+                packed_t0[i * t0_length: (i + 1) * t0_length] for i, (seed, k, tr) in enumerate(zip(seeds, ks, trs))]
+
     def private_key_decode(self, private_key):
         """
         Reverse operation of private_key_encode
@@ -113,30 +154,15 @@ class Encodings:
             raise ValueError(f"Length of private key should be {self.private_key_length}")
 
         # Unpacking the shit
+        eta_length = 32 * (2 * self.const.ETA).bit_length()
+        s2_start = 128 + eta_length * self.const.L
+        t0_start = s2_start + eta_length * self.const.K
         seed = private_key[:32]
         k = private_key[32: 64]
         tr = private_key[64: 128]
-        y = private_key[128: 512]
-        n = len(y) // self.const.L
-        y = [y[i * n: (i + 1) * n] for i in range(self.const.L)]
-        signer_response = private_key[512:896]
-        n = len(signer_response) // self.const.K
-        signer_response = [signer_response[i * n: (i + 1) * n] for i in range(self.const.K)]
-        w = private_key[896:]
-        n = len(w) // self.const.K
-        w = [w[i * n: (i + 1) * n] for i in range(self.const.K)]
-
-        # initialize the vectors
-        s1 = VectorNTT(self.const)
-        s2 = VectorNTT(self.const)
-        t0 = VectorNTT(self.const)
-
-        for i in range(self.const.L):
-            s1[i] = bit_unpack(y[i], self.const.ETA, self.const.ETA)
-        for i in range(self.const.K):
-            s2[i] = bit_unpack(signer_response[i], self.const.ETA, self.const.ETA)
-        for i in range(self.const.K):
-            t0[i] = bit_unpack(w[i], 2 ** (self.const.D - 1) - 1, 2 ** (self.const.D - 1))
+        s1 = bit_unpack_vector(private_key[128: s2_start], self.const.ETA, self.const.ETA)
+        s2 = bit_unpack_vector(private_key[s2_start: t0_start], self.const.ETA, self.const.ETA)
+        t0 = bit_unpack_vector(private_key[t0_start:], 2 ** (self.const.D - 1) - 1, 2 ** (self.const.D - 1))
         return seed, k, tr, s1, s2, t0  # I know there is a lot to unpack. But trust me, It works.
 
     def sign_encode(self, c_hat, signer_response, hint):
@@ -159,8 +185,7 @@ class Encodings:
             raise ValueError("All Coefficients should be 0 or 1")
 
         sigma = c_hat
-        for i in range(self.const.L):
-            sigma += bit_pack(signer_response[i], self.const.GAMMA_1 - 1, self.const.GAMMA_1)
+        sigma += bit_pack(signer_response, self.const.GAMMA_1 - 1, self.const.GAMMA_1)
         sigma += hint_bit_pack(hint, self.const.K, self.const.OMEGA)
 
         assert len(sigma) == self.signature_length, f"We Fucked Up in signing!! It is not {self.signature_length}"
@@ -181,14 +206,10 @@ class Encodings:
         c_hat = sigma[:self.const.LAMBDA // 4]
         x = sigma[self.const.LAMBDA // 4: self.const.LAMBDA // 4 + 32 * self.const.L * (1 + (self.const.GAMMA_1 - 1)
                                                                                         .bit_length())]
-        n = len(x) // self.const.L
-        packed_response = [x[i * n: (i + 1) * n] for i in range(self.const.L)]
         packed_hint = sigma[-(self.const.OMEGA + self.const.K):]
 
-        signer_response = VectorNTT(self.const)
-        for i in range(self.const.L):
-            # This is in the correct range as per the check in sign_encode
-            signer_response[i] = bit_unpack(packed_response[i], self.const.GAMMA_1 - 1, self.const.GAMMA_1)
+        # This is in the correct range as per the check in sign_encode
+        signer_response = bit_unpack_vector(x, self.const.GAMMA_1 - 1, self.const.GAMMA_1)
         hint = hint_bit_unpack(packed_hint, self.const.K, self.const.OMEGA)
         return c_hat, signer_response, hint     # Happy? Less to unpack now.
 
@@ -206,10 +227,8 @@ class Encodings:
         if not commitment.check(0, upper_limit):
             raise ValueError("All Coefficients should be in range [0, (Q-1) / (2 * GAMMA_2) - 1]")
 
-        commitment_encoded = b''
         # This is a bit tricky. We are encoding the commitment in a bit packed format.
-        for i in range(self.const.K):
-            commitment_encoded += simple_bit_pack(commitment[i], upper_limit)
+        commitment_encoded = simple_bit_pack(commitment, upper_limit)
 
         assert len(commitment_encoded) == 32 * self.const.K * upper_limit.bit_length()
         return commitment_encoded # size: 32 * K * bitlen((Q.bit_size - 1) // (2 * GAMMA_2) - 1)
@@ -1,4 +1,7 @@
 from typing import Tuple, List, Any
+
+import numpy as np
+
 from core.utils.overflow.stubborn import NTTModified, VectorNTT
 
 class Encodings:
@@ -11,10 +14,15 @@ class Encodings:
 
     def public_key_encode(self, seed: bytes, t1: VectorNTT) -> bytes: ...
 
+    def public_key_encode_batch(self, seeds: List[bytes], t1: np.ndarray) -> List[bytes]: ...
+
     def public_key_decode(self, public_key: bytes) -> Tuple[bytes, VectorNTT]: ...
 
     def private_key_encode(self, seed: bytes, k: bytes, tr: bytes, s1: VectorNTT, s2: VectorNTT, t0: VectorNTT) -> bytes: ...
 
+    def private_key_encode_batch(self, seeds: List[bytes], ks: List[bytes], trs: List[bytes], s1: np.ndarray,
+                                 s2: np.ndarray, t0: np.ndarray) -> List[bytes]: ...
+
     def private_key_decode(self, private_key: bytes) -> Tuple[bytes, bytes, bytes, VectorNTT, VectorNTT, VectorNTT]: ...
     
     def sign_encode(self, c_hat: bytes, signer_response: VectorNTT, hint: VectorNTT) -> bytes: ...
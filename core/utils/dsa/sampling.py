@@ -1,11 +1,15 @@
+import numpy as np
 from Crypto.Hash import SHAKE256, SHAKE128
 
-from core.utils.advbits import bit_unpack
-from core.utils.bits import int_to_bytes, bytes_to_bits, coeff_from_three_bytes, coeff_from_half_byte
+from core.utils.advbits import unpack_bits
+from core.utils.bits import int_to_bytes, coeffs_from_three_bytes, half_bytes, coeffs_from_half_bytes
+from core.utils.hash import SHAKE128_RATE, SHAKE256_RATE, shake256_reader
 from core.utils.overflow.stubborn import NTTModified, VectorNTT, Ring
 
 
 class Sample:
+    NTT_SAMPLE_BLOCKS = 5
+    BOUNDED_SAMPLE_BLOCKS = 2
 
     def __init__(self, const):
         self.const = const
@@ -23,17 +27,17 @@ class Sample:
         if not len(seed) == self.const.LAMBDA // 4:
             raise ValueError(f"Length of the seed should be {self.const.LAMBDA // 4} bytes")
 
-        sample_c = NTTModified(self.const)
-        shake_256 = SHAKE256.new(seed)
-        s = shake_256.read(8)
-        h = bytes_to_bits(s)
+        c = [0] * 256
+        xof = shake256_reader(seed)
+        h = int.from_bytes(xof.read(8), 'little')
         for i in range(256 - self.const.TO, 256):
-            j = int.from_bytes(shake_256.read(1))
+            j = xof.read_byte()
             while j > i:
-                j = int.from_bytes(shake_256.read(1))
-            sample_c[i] = sample_c[j]
-            sample_c[j] = (-1) ** h[i + self.const.TO - 256]
+                j = xof.read_byte()
+            c[i] = c[j]
+            c[j] = -1 if (h >> (i + self.const.TO - 256)) & 1 else 1
 
+        sample_c = NTTModified(self.const, c)
         assert sample_c.check(-1, 1), "Sample is not in the range [-1, 1]"
         return sample_c
 
@@ -49,15 +53,9 @@ class Sample:
         if not len(seed) == 34:
             raise ValueError("Length of the random seed should be 34 bytes")
 
-        j = 0
-        shake_128 = SHAKE128.new(seed)
-        a_cap = NTTModified(self.const, ring=Ring.TQ)
-        while j < 256:
-            s = shake_128.read(3)
-            a_cap[j] = coeff_from_three_bytes(s[0].to_bytes(), s[1].to_bytes(), s[2].to_bytes())
-            if a_cap[j] is not None:
-                j += 1
-        return a_cap
+        a_cap = self._rejection_sample([SHAKE128.new(seed)], coeffs_from_three_bytes, self.const.Q,
+                                       self.NTT_SAMPLE_BLOCKS * SHAKE128_RATE, SHAKE128_RATE)
+        return NTTModified(self.const, a_cap[0], ring=Ring.TQ)
 
     def rej_bounded_polynomial(self, seed):
         """
@@ -71,21 +69,7 @@ class Sample:
         if not len(seed) == 66:
             raise ValueError("Length of the random seed should be 66 bytes")
 
-        j = 0
-        shake_256 = SHAKE256.new()
-        shake_256.update(seed)
-        a = [0 for _ in range(256)]
-        while j < 256:
-            z = int.from_bytes(shake_256.read(1))
-            z0 = coeff_from_half_byte(z % 16, self.const.ETA)
-            z1 = coeff_from_half_byte(z // 16, self.const.ETA)
-            if z0 is not None:
-                a[j] = z0
-                j += 1
-            if z1 is not None and j < 256:
-                a[j] = z1
-                j += 1
-        return NTTModified(self.const, a)
+        return NTTModified(self.const, self._rej_bounded_coefficients([SHAKE256.new(seed)])[0])
 
     def expand_A(self, seed):
         """
@@ -94,15 +78,35 @@ class Sample:
             seed: A 32 byte string for RBG
 
         Returns:
-            Matrix of List: A_cap from Tq
+            Matrix of List: A_cap from Tq, K vectors of length L sharing one array
         """
-        matrix_vector = [VectorNTT(self.const) for _ in range(self.const.K)]
-        for i in range(self.const.K):
-            for j in range(self.const.L):
-                seed_ = seed + int_to_bytes(j, 1) + int_to_bytes(i, 1)
-                matrix_vector[i].vector[j] = self.rej_ntt_polynomial(seed_)
+        return [VectorNTT(self.const, row, Ring.TQ) for row in self.expand_A_array(seed)]
 
-        return matrix_vector
+    def expand_A_array(self, seed):
+        """
+        Samples all the entries of the Matrix A from T^k*l together
+        Args:
+            seed: A 32 byte string for RBG
+
+        Returns:
+            Array of shape (K, L, 256) where entry [i][j] is sampled from seed + j + i
+        """
+        return self.expand_A_arrays([seed])[0]
+
+    def expand_A_arrays(self, seeds):
+        """
+        Samples the Matrices A of several seeds together
+        Args:
+            seeds: N byte strings of 32 bytes
+
+        Returns:
+            Array of shape (N, K, L, 256)
+        """
+        xofs = [SHAKE128.new(seed + int_to_bytes(j, 1) + int_to_bytes(i, 1))
+                for seed in seeds for i in range(self.const.K) for j in range(self.const.L)]
+        matrix = self._rejection_sample(xofs, coeffs_from_three_bytes, self.const.Q,
+                                        self.NTT_SAMPLE_BLOCKS * SHAKE128_RATE, SHAKE128_RATE)
+        return matrix.reshape(len(seeds), self.const.K, self.const.L, 256)
 
     def expand_S(self, seed):
         """
@@ -116,14 +120,24 @@ class Sample:
         if not len(seed) == 64:
             raise ValueError("Length of the seed should be 64 bytes")
 
-        s1, s2 = [NTTModified(self.const) for _ in range(self.const.L)], [NTTModified(self.const) for _ in range(
-            self.const.K)]
-        for i in range(self.const.L):
-            s1[i] = self.rej_bounded_polynomial(seed + int_to_bytes(i, 2))
-        for i in range(self.const.K):
-            s2[i] = self.rej_bounded_polynomial(seed + int_to_bytes(i + self.const.L, 2))
+        s1, s2 = self.expand_S_arrays([seed])
+        return VectorNTT(self.const, s1[0]), VectorNTT(self.const, s2[0])
 
-        return VectorNTT(self.const, s1, Ring.TQ), VectorNTT(self.const, s2, Ring.TQ)
+    def expand_S_arrays(self, seeds):
+        """
+        Samples the vectors s1, s2 of several seeds together
+        Args:
+            seeds: N byte strings of 64 bytes
+
+        Returns:
+            Tuple of arrays: s1 of shape (N, L, 256), s2 of shape (N, K, 256)
+        """
+        if not all(len(seed) == 64 for seed in seeds):
+            raise ValueError("Length of the seed should be 64 bytes")
+
+        xofs = [SHAKE256.new(seed + int_to_bytes(i, 2)) for seed in seeds for i in range(self.const.L + self.const.K)]
+        s = self._rej_bounded_coefficients(xofs).reshape(len(seeds), self.const.L + self.const.K, 256)
+        return s[:, :self.const.L], s[:, self.const.L:]
 
     def expand_mask(self, seed, coefficient):
         """
@@ -138,10 +152,52 @@ class Sample:
         if not len(seed) == 64:
             raise ValueError("Length of the seed should be 64 bytes")
 
-        y = VectorNTT(self.const)
         c = 1 + (self.const.GAMMA_1 - 1).bit_length()
-        for i in range(self.const.L):
-            seed_ = seed + int_to_bytes(i + coefficient, 2)
-            v = SHAKE256.new(seed_).read(32 * c)
-            y[i] = bit_unpack(v, self.const.GAMMA_1 - 1, self.const.GAMMA_1)
-        return y
+        v = b''.join(SHAKE256.new(seed + int_to_bytes(i + coefficient, 2)).read(32 * c) for i in range(self.const.L))
+        return VectorNTT(self.const, self.const.GAMMA_1 - unpack_bits(v, c))
+
+    def _rej_bounded_coefficients(self, xofs):
+        """
+        Samples one polynomial with coefficients in [-ETA, ETA] from every XOF by half byte rejection
+        Args:
+            xofs: List of SHAKE256 objects
+
+        Returns:
+            Array of shape (len(xofs), 256)
+        """
+        bound = 15 if self.const.ETA == 2 else 9
+        b = self._rejection_sample(xofs, half_bytes, bound, self.BOUNDED_SAMPLE_BLOCKS * SHAKE256_RATE,
+                                   SHAKE256_RATE)
+        return coeffs_from_half_bytes(b, self.const.ETA)
+
+    @staticmethod
+    def _rejection_sample(xofs, parse, bound, first_read, next_read):
+        """
+        Draws 256 coefficients from every XOF, keeping the candidates below bound in their stream order.
+        The first reads of all the XOFs are parsed and filtered together, the rare XOFs that fall short
+        are topped up one read at a time.
+        Args:
+            xofs: List of XOF objects with a read method
+            parse: Function splitting a byte string into an int64 array of candidates
+            bound: Candidates greater or equal to bound are rejected
+            first_read: Number of bytes read from every XOF up front
+            next_read: Number of bytes read when more candidates are needed
+
+        Returns:
+            Array of shape (len(xofs), 256)
+        """
+        candidates = parse(b''.join(xof.read(first_read) for xof in xofs)).reshape(len(xofs), -1)
+        accepted = candidates < bound
+        complete = accepted.sum(axis=1) >= 256
+        sampled = np.empty((len(xofs), 256), dtype=np.int64)
+        if complete.any():
+            # a stable sort moves the accepted candidates of every row to the front, keeping their order
+            order = np.argsort(~accepted[complete], axis=1, kind='stable')[:, :256]
+            sampled[complete] = np.take_along_axis(candidates[complete], order, axis=1)
+        for row in np.flatnonzero(~complete):
+            a = candidates[row][accepted[row]]
+            while len(a) < 256:
+                block = parse(xofs[row].read(next_read))
+                a = np.concatenate((a, block[block < bound]))
+            sampled[row] = a[:256]
+        return sampled
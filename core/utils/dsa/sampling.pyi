@@ -1,9 +1,14 @@
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Callable
+
+import numpy as np
+
 from core.utils.overflow.stubborn import NTTModified, VectorNTT
 
 Matrix = List[List[int]]
 
 class Sample:
+    NTT_SAMPLE_BLOCKS: int
+    BOUNDED_SAMPLE_BLOCKS: int
     const: Any
 
     def __init__(self, const) -> None: ...
@@ -16,7 +21,18 @@ class Sample:
 
     def expand_A(self, seed: bytes) -> List[VectorNTT]: ...
 
+    def expand_A_array(self, seed: bytes) -> np.ndarray: ...
+
+    def expand_A_arrays(self, seeds: List[bytes]) -> np.ndarray: ...
+
     def expand_S(self, seed: bytes) -> Tuple[VectorNTT, VectorNTT]: ...
 
+    def expand_S_arrays(self, seeds: List[bytes]) -> Tuple[np.ndarray, np.ndarray]: ...
+
     def expand_mask(self, seed: bytes, coefficient: int) -> VectorNTT: ...
 
+    def _rej_bounded_coefficients(self, xofs: List[Any]) -> np.ndarray: ...
+
+    @staticmethod
+    def _rejection_sample(xofs: List[Any], parse: Callable[[bytes], np.ndarray], bound: int, first_read: int,
+                          next_read: int) -> np.ndarray: ...
@@ -1,5 +1,80 @@
 from Crypto.Hash import SHAKE128, SHAKE256, SHA3_512, SHA3_256
 
+SHAKE128_RATE = 168
+SHAKE256_RATE = 136
+
+
+class XOFReader:
+    """
+    Buffered reader over a SHAKE object. The XOF is squeezed one rate block at a time and reads are
+    served from the buffer, so a sampler asking for a byte at a time pays for one squeeze per block.
+
+    Attributes:
+        xof: SHAKE128 or SHAKE256 object being squeezed
+        rate: Number of bytes squeezed at once
+        buffer: Last bytes squeezed from the xof
+        offset: Position of the next unread byte in buffer
+    """
+
+    def __init__(self, xof, rate):
+        self.xof = xof
+        self.rate = rate
+        self.buffer = b''
+        self.offset = 0
+
+    def read(self, length):
+        """
+        Reads the next bytes of the XOF output
+
+        Args:
+            length: Number of bytes
+
+        Returns:
+            bytes: The same bytes the xof itself would return for a read of length
+        """
+        while len(self.buffer) - self.offset < length:
+            self.buffer, self.offset = self.buffer[self.offset:] + self.xof.read(self.rate), 0
+        output = self.buffer[self.offset: self.offset + length]
+        self.offset += length
+        return output
+
+    def read_byte(self):
+        """
+        Reads the next byte of the XOF output
+
+        Returns:
+            int: The byte as an integer in range(0, 256)
+        """
+        if self.offset == len(self.buffer):
+            self.buffer, self.offset = self.xof.read(self.rate), 0
+        byte = self.buffer[self.offset]
+        self.offset += 1
+        return byte
+
+
+def shake128_reader(ctx):
+    """
+    Creates a buffered SHAKE128 reader for the given context
+    Args:
+        ctx: a byte string
+
+    Returns:
+        XOFReader: squeezing 168 byte blocks
+    """
+    return XOFReader(SHAKE128.new(ctx), SHAKE128_RATE)
+
+
+def shake256_reader(ctx):
+    """
+    Creates a buffered SHAKE256 reader for the given context
+    Args:
+        ctx: a byte string
+
+    Returns:
+        XOFReader: squeezing 136 byte blocks
+    """
+    return XOFReader(SHAKE256.new(ctx), SHAKE256_RATE)
+
 
 def shake128(ctx, byte_lengths):
     """
@@ -1,4 +1,25 @@
-from typing import List, Tuple
+from typing import List, Tuple, Any
+
+SHAKE128_RATE: int
+SHAKE256_RATE: int
+
+
+class XOFReader:
+    xof: Any
+    rate: int
+    buffer: bytes
+    offset: int
+
+    def __init__(self, xof: Any, rate: int) -> None: ...
+
+    def read(self, length: int) -> bytes: ...
+
+    def read_byte(self) -> int: ...
+
+
+def shake128_reader(ctx: bytes) -> XOFReader: ...
+
+def shake256_reader(ctx: bytes) -> XOFReader: ...
 
 def shake128(ctx: List[bytes], byte_lengths: List[int]) -> bytes: ...
 
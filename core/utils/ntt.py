@@ -1,4 +1,8 @@
+import numpy as np
+
+from core.utils.arithmetic import get_arithmetic
 from core.utils.bits import bytes_to_bits
+from core.utils.hash import SHAKE128_RATE
 from Crypto.Hash import SHAKE128
 
 
@@ -158,10 +162,185 @@ class NTT:
         assert len(byte_array) == expected_length, f"The byte array must be of length {expected_length}."
         f"Not {len(byte_array)}"
 
-        bit_array = bytes_to_bits(byte_array)
-        f = [0] * 256
-        for i in range(256):
-            x = sum(bit_array[2 * i * eta + j] for j in range(eta))
-            y = sum(bit_array[2 * i * eta + eta + j] for j in range(eta))
-            f[i] = (x - y) % self.q
-        return f
+        bit_array = bytes_to_bits(byte_array).reshape(256, 2, eta).sum(axis=2, dtype=np.int64)
+        f = (bit_array[:, 0] - bit_array[:, 1]) % self.q
+        return f.tolist()
+
+
+class ArrayNTT(NTT):
+    """
+    NTT engine backed by numpy arrays. Every method accepts a single polynomial of shape (256,)
+    or a whole vector of shape (k, 256) and transforms all the polynomials in one call.
+    Results are identical to the ones of NTT whichever arithmetic is selected.
+
+    Attributes:
+        arithmetic: ModularArithmetic running the butterflies (eager or montgomery)
+        zeta_doubles: zeta square values as an int64 array
+    """
+    INVERSE_SCALE_FACTOR = 3303
+    SAMPLE_BLOCKS = 3
+
+    def __init__(self, const, arithmetic=None):
+        super().__init__(const)
+        self.arithmetic = get_arithmetic(arithmetic, self.q, self.zeta_values, self.INVERSE_SCALE_FACTOR)
+        self.zeta_doubles = np.array(self.zeta_double_value, dtype=np.int64)
+
+    def ntt(self, f):
+        """
+        Computes the NTT of a polynomial or of every polynomial in a vector.
+
+        Args:
+            f: Array of polynomial coefficients in Z_q of shape (..., 256).
+
+        Returns:
+            Array of NTT coefficients f_cap in Z_q with the same shape.
+        """
+        f_cap = np.array(f, dtype=np.int64)
+        assert f_cap.shape[-1] == 256, f"Length of array f should be {256}, Not {f_cap.shape[-1]}"
+
+        return self.arithmetic.ntt(f_cap, 2)
+
+    def ntt_inverse(self, f_cap):
+        """
+        Computes the inverse NTT of a polynomial or of every polynomial in a vector.
+
+        Args:
+            f_cap: Array of NTT coefficients in Z_q of shape (..., 256).
+
+        Returns:
+            Array of polynomial coefficients f in Z_q with the same shape.
+        """
+        f = np.array(f_cap, dtype=np.int64)
+        assert f.shape[-1] == 256, f"Length of f_cap must be 256. Not {f.shape[-1]}."
+
+        return self.arithmetic.ntt_inverse(f, 2)
+
+    def multiply_ntt(self, f_cap, g_cap):
+        """
+        Computes the multiplication for elements from T_q, broadcasting over the leading axes
+
+        Args:
+            f_cap: Array of shape (..., 256) in T_q
+            g_cap: Array of shape (..., 256) in T_q
+
+        Returns:
+             Multiplication of these elements
+        """
+        f_cap = np.asarray(f_cap, dtype=np.int64)
+        g_cap = np.asarray(g_cap, dtype=np.int64)
+        assert f_cap.shape[-1] == 256 and g_cap.shape[-1] == 256, (f" Length of f_cap and g_cap must be 256. Not "
+                                                                   f"{f_cap.shape[-1]} and {g_cap.shape[-1]}.")
+
+        a0, a1 = f_cap[..., 0::2], f_cap[..., 1::2]
+        b0, b1 = g_cap[..., 0::2], g_cap[..., 1::2]
+        h_cap = np.empty(np.broadcast_shapes(f_cap.shape, g_cap.shape), dtype=np.int64)
+        h_cap[..., 0::2] = (a0 * b0 + a1 * b1 * self.zeta_doubles) % self.q
+        h_cap[..., 1::2] = (a0 * b1 + a1 * b0) % self.q
+        return h_cap
+
+    def get_sample_ntt(self, byte_array):
+        """
+        Samples a pseudorandom element of T_q using a 34-byte seed and two indices. The XOF is squeezed
+        SAMPLE_BLOCKS rate blocks at a time and more blocks are only read when too few values were accepted.
+
+        Args:
+            byte_array: 34-byte seed (input as a byte array).
+
+        Returns:
+            Array of shape (256,) with the same coefficients as NTT.get_sample_ntt
+        """
+        assert len(byte_array) == 34, f"The byte array must be 34 bytes in length. Not {len(byte_array)}."
+
+        shake = SHAKE128.new(byte_array)
+        a = self._parse_candidates(shake.read(self.SAMPLE_BLOCKS * SHAKE128_RATE))
+        a = a[a < self.q]
+        while len(a) < self.n:
+            block = self._parse_candidates(shake.read(SHAKE128_RATE))
+            a = np.concatenate((a, block[block < self.q]))
+        return a[:self.n]
+
+    def get_sample_ntt_matrix(self, ro, k):
+        """
+        Samples all the entries of the matrix A from the 32-byte seed ro. The first blocks of every
+        entry are split and rejected together, the rare entries that need more bytes are completed one by one.
+
+        Args:
+            ro: 32 byte seed
+            k: Number of rows and columns
+
+        Returns:
+            Array of shape (k, k, 256) where entry [i][j] is sampled from ro + j + i
+        """
+        return self.get_sample_ntt_matrices([ro], k)[0]
+
+    def get_sample_ntt_matrices(self, ros, k):
+        """
+        Samples the matrices A of several seeds together, see get_sample_ntt_matrix
+
+        Args:
+            ros: N seeds of 32 bytes
+            k: Number of rows and columns
+
+        Returns:
+            Array of shape (N, k, k, 256)
+        """
+        assert all(len(ro) == 32 for ro in ros), "The seeds must be 32 bytes in length."
+
+        shakes = [SHAKE128.new(ro + j.to_bytes() + i.to_bytes()) for ro in ros for i in range(k) for j in range(k)]
+        buffer = b''.join(shake.read(self.SAMPLE_BLOCKS * SHAKE128_RATE) for shake in shakes)
+        candidates = self._parse_candidates(buffer).reshape(len(shakes), -1)
+        accepted = candidates < self.q
+        complete = accepted.sum(axis=1) >= self.n
+        A = np.empty((len(shakes), self.n), dtype=np.int64)
+        # stable sort moves the accepted values to the front of each row while keeping their order
+        if complete.any():
+            order = np.argsort(~accepted[complete], axis=1, kind='stable')[:, :self.n]
+            A[complete] = np.take_along_axis(candidates[complete], order, axis=1)
+        for row in np.flatnonzero(~complete):
+            a = candidates[row][accepted[row]]
+            while len(a) < self.n:
+                block = self._parse_candidates(shakes[row].read(SHAKE128_RATE))
+                a = np.concatenate((a, block[block < self.q]))
+            A[row] = a[:self.n]
+        return A.reshape(len(ros), k, k, self.n)
+
+    def get_sample_polyCBD(self, byte_array, eta):
+        """
+        Samples a pseudorandom polynomial from the distribution D_eta(R_q).
+
+        Args:
+            byte_array: Byte array of size 64 * eta (input as a byte array).
+            eta: A constant that determines the distribution.
+
+        Returns:
+            Array of shape (256,) with the same coefficients as NTT.get_sample_polyCBD
+        """
+        eta = eta or self.eta
+        return self.get_sample_polyCBD_batch([byte_array], eta)[0]
+
+    def get_sample_polyCBD_batch(self, byte_arrays, eta):
+        """
+        Samples one polynomial from D_eta(R_q) per PRF output, all of them with the same eta, in one pass.
+
+        Args:
+            byte_arrays: Sequence of byte arrays of size 64 * eta each
+            eta: A constant that determines the distribution (2 or 3)
+
+        Returns:
+            Array of shape (len(byte_arrays), 256) with coefficients in Z_q
+        """
+        expected_length = 64 * eta
+        assert all(len(byte_array) == expected_length for byte_array in byte_arrays), \
+            f"The byte arrays must be of length {expected_length}."
+
+        bit_array = bytes_to_bits(b''.join(byte_arrays)).reshape(len(byte_arrays), self.n, 2, eta)
+        x_y = bit_array.sum(axis=3, dtype=np.int64)
+        return (x_y[..., 0] - x_y[..., 1]) % self.q
+
+    @staticmethod
+    def _parse_candidates(byte_string):
+        c = np.frombuffer(byte_string, dtype=np.uint8).reshape(-1, 3).astype(np.int64)
+        d = np.empty((len(c), 2), dtype=np.int64)
+        d[:, 0] = c[:, 0] + 256 * (c[:, 1] & 15)
+        d[:, 1] = (c[:, 1] >> 4) + 16 * c[:, 2]
+        return d.reshape(-1)
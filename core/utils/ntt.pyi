@@ -1,4 +1,9 @@
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional
+
+import numpy as np
+
+from core.utils.arithmetic import ModularArithmetic
+
 
 class NTT:
     zeta_values: Tuple[int]
@@ -22,5 +27,29 @@ class NTT:
     def _base_case_multiply(self, a0:int, a1:int, b0:int, b1:int, zeta:int) -> Tuple[int, int]: ...
 
 
+class ArrayNTT(NTT):
+    INVERSE_SCALE_FACTOR: int
+    SAMPLE_BLOCKS: int
+    arithmetic: ModularArithmetic
+    zeta_doubles: np.ndarray
+
+    def __init__(self, const: Any, arithmetic: Optional[str] = None) -> None: ...
+
+    def ntt(self, f: np.ndarray | List[int]) -> np.ndarray: ...
+
+    def ntt_inverse(self, f_cap: np.ndarray | List[int]) -> np.ndarray: ...
+
+    def multiply_ntt(self, f_cap: np.ndarray | List[int], g_cap: np.ndarray | List[int]) -> np.ndarray: ...
+
+    def get_sample_ntt(self, byte_array: bytes) -> np.ndarray: ...
+
+    def get_sample_ntt_matrix(self, ro: bytes, k: int) -> np.ndarray: ...
+
+    def get_sample_ntt_matrices(self, ros: List[bytes], k: int) -> np.ndarray: ...
+
+    def get_sample_polyCBD(self, byte_array: bytes, eta: int) -> np.ndarray: ...
 
+    def get_sample_polyCBD_batch(self, byte_arrays: List[bytes], eta: int) -> np.ndarray: ...
 
+    @staticmethod
+    def _parse_candidates(byte_string: bytes) -> np.ndarray: ...
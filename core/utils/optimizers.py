@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 def mod_symmetric(m, a):
     """
@@ -139,3 +141,121 @@ def use_hint(h, r, Q, GAMMA_2):
     elif h == 1 and r0 <= 0:
         return (r1 - 1) % m
     return r1
+
+
+def mod_symmetric_array(m, a):
+    """
+    Array version of mod_symmetric, computed for every element of m
+
+    Args:
+        m (np.ndarray): int64 array
+        a (int): The positive integer modulus.
+
+    Returns:
+        np.ndarray: m (± mod a) in the symmetric range −⌈a/2⌉ < m′ ≤ ⌊a/2⌋.
+    """
+    if a <= 0:
+        raise ValueError("The modulus 'a' must be a positive integer.")
+
+    m_standard = np.asarray(m, dtype=np.int64) % a
+    return np.where(m_standard > a // 2, m_standard - a, m_standard)
+
+
+def power2_round_array(r, Q, D):
+    """
+    Array version of power2_round
+    Args:
+        r: int64 array
+        Q: Modulus
+        D: Drop bits
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The rounded numbers and the dropped bits.
+    """
+    r1 = np.asarray(r, dtype=np.int64) % Q
+    r0 = mod_symmetric_array(r1, 2 ** D)
+    return (r1 - r0) >> D, r0
+
+
+def decompose_array(r, Q, GAMMA_2):
+    """
+    Array version of decompose
+    Args:
+        r: int64 array
+        Q: Modulus
+        GAMMA_2: Low Order Rounding Range
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The multiples of GAMMA_2 and the small numbers.
+    """
+    r_plus = np.asarray(r, dtype=np.int64) % Q
+    r0 = mod_symmetric_array(r_plus, 2 * GAMMA_2)
+    corner = r_plus - r0 == Q - 1
+    r1 = np.where(corner, 0, (r_plus - r0) // (2 * GAMMA_2))
+    return r1, np.where(corner, r0 - 1, r0)
+
+
+def high_bits_array(r, Q, GAMMA_2):
+    """
+    Array version of high_bits
+    """
+    return decompose_array(r, Q, GAMMA_2)[0]
+
+
+def low_bits_array(r, Q, GAMMA_2):
+    """
+    Array version of low_bits
+    """
+    return decompose_array(r, Q, GAMMA_2)[1]
+
+
+def make_hint_array(z, r, Q, GAMMA_2):
+    """
+    Array version of make_hint
+
+    Args:
+        z: int64 array
+        r: int64 array
+        Q: Modulus
+        GAMMA_2: Low Order Rounding Range
+
+    Returns:
+        np.ndarray: 1 where adding z to r alters the high bits of r, 0 elsewhere.
+    """
+    assert np.all(r < Q), "r should be less than Q"
+    assert np.all(z < Q), "z should be less than Q"
+
+    r1 = high_bits_array(r, Q, GAMMA_2)
+    v1 = high_bits_array(np.add(r, z), Q, GAMMA_2)
+    return (r1 != v1).astype(np.int64)
+
+
+def use_hint_array(h, r, Q, GAMMA_2):
+    """
+    Array version of use_hint
+
+    Args:
+        h: int64 array of hints
+        r: int64 array
+        Q: Modulus
+        GAMMA_2: Low Order Rounding Range
+
+    Returns:
+        np.ndarray: The numbers after applying the hints.
+    """
+    assert np.all(r < Q), "r should be less than Q"
+
+    m = (Q - 1) // (2 * GAMMA_2)
+    r1, r0 = decompose_array(r, Q, GAMMA_2)
+    adjusted = np.where(r0 > 0, r1 + 1, r1 - 1) % m
+    return np.where(np.asarray(h) == 1, adjusted, r1)
+
+
+# Array version of every scalar function returning one value, used by NTTModified.apply and VectorNTT.apply
+ARRAY_KERNELS = {
+    mod_symmetric: mod_symmetric_array,
+    high_bits: high_bits_array,
+    low_bits: low_bits_array,
+    make_hint: make_hint_array,
+    use_hint: use_hint_array,
+}
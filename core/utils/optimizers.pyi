@@ -1,4 +1,6 @@
-from typing import Tuple
+from typing import Tuple, Callable, Dict
+
+import numpy as np
 
 
 def power2_round(r: int, Q: int, D: int) -> Tuple[int, int]: ...
@@ -14,3 +16,19 @@ def mod_symmetric(r: int, Q: int) -> int: ...
 def make_hint(z: int, r: int, Q: int, GAMMA_2: int) -> bool: ...
 
 def use_hint(h: bool, r: int, Q: int, GAMMA_2: int) -> int: ...
+
+def mod_symmetric_array(m: np.ndarray, a: int) -> np.ndarray: ...
+
+def power2_round_array(r: np.ndarray, Q: int, D: int) -> Tuple[np.ndarray, np.ndarray]: ...
+
+def decompose_array(r: np.ndarray, Q: int, GAMMA_2: int) -> Tuple[np.ndarray, np.ndarray]: ...
+
+def high_bits_array(r: np.ndarray, Q: int, GAMMA_2: int) -> np.ndarray: ...
+
+def low_bits_array(r: np.ndarray, Q: int, GAMMA_2: int) -> np.ndarray: ...
+
+def make_hint_array(z: np.ndarray, r: np.ndarray, Q: int, GAMMA_2: int) -> np.ndarray: ...
+
+def use_hint_array(h: np.ndarray, r: np.ndarray, Q: int, GAMMA_2: int) -> np.ndarray: ...
+
+ARRAY_KERNELS: Dict[Callable, Callable]
@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import List
 
-from core.utils.optimizers import mod_symmetric
+import numpy as np
+
+from core.utils.arithmetic import get_arithmetic
+from core.utils.optimizers import ARRAY_KERNELS
 
 
 class ConstantMeta(type):
@@ -16,10 +19,30 @@ class Ring(Enum):
     TQ = 0
 
 
+def arithmetic_for(config, arithmetic=None):
+    """
+    Returns the shared ModularArithmetic of a parameter set for the given mode (eager by default)
+    """
+    return get_arithmetic(arithmetic, config.Q, config.ZETA_VALUES, config.NTT_SCALE_FACTOR)
+
+
+def centered(array, q):
+    """
+    Maps every element of an array to its representative in the range −⌈q/2⌉ < m′ ≤ ⌊q/2⌋
+    """
+    array = array % q
+    return np.where(array > q // 2, array - q, array)
+
+
 class NTTModified:
+    """
+    A polynomial of R_q or T_q backed by an int64 array of 256 coefficients.
+    The array may be a row of a VectorNTT block, in which case writes go through to the vector.
+    """
 
     def __init__(self, config, polynomial=None, ring=Ring.RQ):
-        self.polynomial = polynomial or [0] * 256
+        self.polynomial = np.zeros(256, dtype=np.int64) if polynomial is None else np.asarray(polynomial,
+                                                                                            dtype=np.int64)
         self.config = config
         self.Ring = ring
 
@@ -27,161 +50,158 @@ class NTTModified:
     def ring(self):
         return self.Ring
 
-    def ntt(self):
+    def ntt(self, arithmetic=None):
         if self.ring == Ring.TQ:
             return self
-        polynomial = self.polynomial.copy()
-        m = 0
-        length = 128
-        while length >= 1:
-            start = 0
-            while start < 256:
-                m += 1
-                z = self.config.ZETA_VALUES[m]
-                for j in range(start, start + length):
-                    t = (z * polynomial[j + length]) % self.config.Q
-                    polynomial[j + length] = (polynomial[j] - t) % self.config.Q
-                    polynomial[j] = (polynomial[j] + t) % self.config.Q
-                start += 2 * length
-            length //= 2
+        polynomial = arithmetic_for(self.config, arithmetic).ntt(self.polynomial.copy(), 1)
         return NTTModified(self.config, polynomial, Ring.TQ)
 
-    def inverse(self):
+    def inverse(self, arithmetic=None):
         if self.ring == Ring.RQ:
             return self
-        polynomial = self.polynomial.copy()
-        m = 256
-        length = 1
-        while length < 256:
-            start = 0
-            while start < 256:
-                m -= 1
-                z = -self.config.ZETA_VALUES[m]
-                for j in range(start, start + length):
-                    t = polynomial[j]
-                    polynomial[j] = (t + polynomial[j + length]) % self.config.Q
-                    polynomial[j + length] = (z * (t - polynomial[j + length])) % self.config.Q
-                start += 2 * length
-            length *= 2
-
-        for i in range(256):
-            polynomial[i] = (polynomial[i] * self.config.NTT_SCALE_FACTOR) % self.config.Q
-
+        polynomial = arithmetic_for(self.config, arithmetic).ntt_inverse(self.polynomial.copy(), 1)
         return NTTModified(self.config, polynomial, Ring.RQ)
 
     def norm(self):
-        return abs(max([mod_symmetric(element, self.config.Q) for element in self.polynomial]))
+        return int(np.abs(centered(self.polynomial, self.config.Q)).max())
 
     def check(self, start, end=None):
         if end is None:
-            return all(element <= start for element in self.polynomial)
-        return all(start <= element <= end for element in self.polynomial)
+            return bool(np.all(self.polynomial <= start))
+        return bool(np.all((start <= self.polynomial) & (self.polynomial <= end)))
 
     def apply(self, function, *args, other=None):
-        if other:
-            return NTTModified(self.config, [function(element[0], element[1], *args) for element in zip(self.polynomial,
-                                                                                                        other.polynomial
-                                                                                                        )])
-        return NTTModified(self.config, [function(element, *args) for element in self.polynomial])
+        kernel = ARRAY_KERNELS.get(function)
+        if kernel is not None:
+            operands = (self.polynomial,) if other is None else (self.polynomial, other.polynomial)
+            return NTTModified(self.config, kernel(*operands, *args))
+        if other is not None:
+            return NTTModified(self.config, [function(x, y, *args) for x, y in zip(self.polynomial.tolist(),
+                                                                                   other.polynomial.tolist())])
+        return NTTModified(self.config, [function(element, *args) for element in self.polynomial.tolist()])
 
     def __add__(self, other):
-        return NTTModified(self.config, [(self_x + other_x) % self.config.Q for self_x, other_x in zip(self.polynomial,
-                                                                                                       other.polynomial)
-                                         ])
+        return NTTModified(self.config, (self.polynomial + other.polynomial) % self.config.Q, self.ring)
 
     def __sub__(self, other):
-        return NTTModified(self.config, [(self_x - other_x) % self.config.Q for self_x, other_x in zip(self.polynomial,
-                                                                                                       other.polynomial)
-                                         ], self.ring)
+        return NTTModified(self.config, (self.polynomial - other.polynomial) % self.config.Q, self.ring)
 
     def __mul__(self, other):
         if isinstance(other, int):
-            return NTTModified(self.config, [(self_x * other) for self_x in self.polynomial])
-        return NTTModified(self.config, [(self_x * other_x) % self.config.Q for self_x, other_x in zip(self.polynomial,
-                                         other.polynomial)], self.ring)
+            return NTTModified(self.config, self.polynomial * other, self.ring)
+        return NTTModified(self.config, (self.polynomial * other.polynomial) % self.config.Q, self.ring)
 
     def __neg__(self):
-        return NTTModified(self.config, [(-element) % self.config.Q for element in self.polynomial], self.ring)
+        return NTTModified(self.config, (-self.polynomial) % self.config.Q, self.ring)
 
     def __eq__(self, other):
-        return self.polynomial == other.polynomial
+        return np.array_equal(self.polynomial, other.polynomial)
 
     def __repr__(self):
-        return f'NTT {self.ring}: len({len(self.polynomial)}), {self.polynomial[0:10]} ...'
+        return f'NTT {self.ring}: len({len(self.polynomial)}), {self.polynomial[0:10].tolist()} ...'
 
     def __getitem__(self, item):
-        return self.polynomial[item]
+        value = self.polynomial[item]
+        return int(value) if np.ndim(value) == 0 else value
 
     def __setitem__(self, key, value):
         self.polynomial[key] = value
 
 
 class VectorNTT:
+    """
+    A vector of polynomials held as one contiguous (n, 256) int64 array.
+    All the polynomials of a vector live in the same ring, so ntt, inverse and the arithmetic
+    operators run over the whole block at once. Indexing returns an NTTModified view of a row.
+    """
 
-    def __init__(self, config, vector=None, ring=Ring.TQ):
+    def __init__(self, config, vector=None, ring=None):
         self.config = config
-        self.vector = vector or [NTTModified(self.config) for _ in range(self.config.L)]
-        self.ring = ring or vector[0].ring
+        if vector is None:
+            self.array = np.zeros((self.config.L, 256), dtype=np.int64)
+        elif isinstance(vector, np.ndarray):
+            self.array = vector.astype(np.int64, copy=False)
+        else:
+            self.array = np.array([polynomial.polynomial for polynomial in vector], dtype=np.int64)
+        self.ring = ring or (vector[0].ring if isinstance(vector, List) and vector else Ring.RQ)
+
+    @property
+    def vector(self):
+        return [self[i] for i in range(len(self.array))]
 
     def __getitem__(self, item):
-        return self.vector[item]
+        return NTTModified(self.config, self.array[item], self.ring)
+
+    def __len__(self):
+        return len(self.array)
 
     def from_list(self, lst):
-        self.vector = [NTTModified(self.config, element) for element in lst]
+        self.array = np.array(lst, dtype=np.int64)
 
     def apply(self, function, *args, other=None):
-        if other:
-            return VectorNTT(self.config, [vector[0].apply(function, *args, other=vector[1]) for vector in zip(
-                self.vector, other.vector)])
-        return VectorNTT(self.config, [vector.apply(function, *args) for vector in self.vector])
+        kernel = ARRAY_KERNELS.get(function)
+        if kernel is not None:
+            operands = (self.array,) if other is None else (self.array, other.array)
+            return VectorNTT(self.config, kernel(*operands, *args), Ring.RQ)
+        if other is not None:
+            return VectorNTT(self.config, np.array([[function(x, y, *args) for x, y in zip(self_row, other_row)]
+                                                    for self_row, other_row in zip(self.array.tolist(),
+                                                                                   other.array.tolist())]),
+                             Ring.RQ)
+        return VectorNTT(self.config, np.array([[function(x, *args) for x in row] for row in self.array.tolist()]),
+                         Ring.RQ)
 
     def norm(self):
-        return max([polynomial.norm() for polynomial in self.vector])
+        return int(np.abs(centered(self.array, self.config.Q)).max())
 
     def __setitem__(self, key, value):
-        self.vector[key] = value
+        self.array[key] = value.polynomial
+        self.ring = value.ring
 
     def to_list(self):
-        return [vector.polynomial for vector in self.vector]
+        return self.array.tolist()
 
-    def ntt(self):
-        return VectorNTT(self.config, [polynomial.ntt() for polynomial in self.vector])
+    def ntt(self, arithmetic=None):
+        if self.ring == Ring.TQ:
+            return self
+        array = arithmetic_for(self.config, arithmetic).ntt(self.array.copy(), 1)
+        return VectorNTT(self.config, array, Ring.TQ)
 
-    def inverse(self):
-        return VectorNTT(self.config, [polynomial.inverse() for polynomial in self.vector], ring=Ring.RQ)
+    def inverse(self, arithmetic=None):
+        if self.ring == Ring.RQ:
+            return self
+        array = arithmetic_for(self.config, arithmetic).ntt_inverse(self.array.copy(), 1)
+        return VectorNTT(self.config, array, Ring.RQ)
 
     def check(self, start, end=None):
         if end is None:
-            return all(polynomial.check(start) for polynomial in self.vector)
-        return all(polynomial.check(start, end) for polynomial in self.vector)
+            return bool(np.all(self.array <= start))
+        return bool(np.all((start <= self.array) & (self.array <= end)))
 
     def __repr__(self):
-        return (f'VectorNTT object: len ({len(self.vector)})'
-                f'\n\t{self.vector[0]}, '
-                f'\n\t{self.vector[-1]}\n'
+        return (f'VectorNTT object: len ({len(self.array)})'
+                f'\n\t{self[0]}, '
+                f'\n\t{self[-1]}\n'
                 )
 
     def __add__(self, other):
-        return VectorNTT(self.config, [self_ntt + other_ntt for self_ntt, other_ntt in zip(self.vector, other.vector)])
+        return VectorNTT(self.config, (self.array + other.array) % self.config.Q, self.ring)
 
     def __sub__(self, other):
-        return VectorNTT(self.config, [self_ntt - other_ntt for self_ntt, other_ntt in zip(self.vector, other.vector)])
+        return VectorNTT(self.config, (self.array - other.array) % self.config.Q, self.ring)
 
     def __neg__(self):
-        return VectorNTT(self.config, [-polynomial for polynomial in self.vector], self.ring)
+        return VectorNTT(self.config, (-self.array) % self.config.Q, self.ring)
 
     def __eq__(self, other):
-        return self.vector == other.vector
+        return np.array_equal(self.array, other.array)
 
     def __mul__(self, other):
         if isinstance(other, NTTModified):
-            return VectorNTT(self.config, [self_ntt * other for self_ntt in self.vector])
+            return VectorNTT(self.config, (self.array * other.polynomial) % self.config.Q, self.ring)
         if isinstance(other, List):
-            result = VectorNTT(self.config, [NTTModified(self.config) for _ in range(self.config.K)])
-            for i in range(self.config.K):
-                for j in range(self.config.L):
-                    result[j] = result[j] + (self.vector[j] * other[i][j])
-            return result
+            # other is the K x L matrix A as a list of K vectors of length L: computes A * self
+            matrix = np.stack([row.array for row in other])
+            return VectorNTT(self.config, (matrix * self.array).sum(axis=1) % self.config.Q, self.ring)
         if isinstance(other, int):
-            return VectorNTT(self.config, [polynomial * other for polynomial in self.vector])
-
+            return VectorNTT(self.config, self.array * other, self.ring)
@@ -1,24 +1,33 @@
 from enum import Enum
 from typing import List, Optional, Union, Any, Callable
 
+import numpy as np
+
+from core.utils.arithmetic import ModularArithmetic
+
 
 class Ring(Enum):
     RQ: int
     TQ: int
 
+def arithmetic_for(config: Any, arithmetic: Optional[str] = None) -> ModularArithmetic: ...
+
+def centered(array: np.ndarray, q: int) -> np.ndarray: ...
+
 class NTTModified:
     config: Any
-    polynomial: List[int]
+    polynomial: np.ndarray
     Ring: Ring
 
-    def __init__(self, config: Any, polynomial: Optional[List[int]] = None, ring: Optional[Ring] = Ring.RQ) -> None: ...
+    def __init__(self, config: Any, polynomial: Optional[np.ndarray | List[int]] = None,
+                 ring: Optional[Ring] = Ring.RQ) -> None: ...
 
     @property
     def ring(self) -> Ring: ...
 
-    def ntt(self) -> NTTModified: ...
+    def ntt(self, arithmetic: Optional[str] = None) -> NTTModified: ...
 
-    def inverse(self) -> NTTModified: ...
+    def inverse(self, arithmetic: Optional[str] = None) -> NTTModified: ...
 
     def norm(self) -> int: ...
 
@@ -38,30 +47,35 @@ class NTTModified:
 
     def __eq__(self, other: NTTModified) -> bool: ...
 
-    def __getitem__(self, item: int) -> int: ...
+    def __getitem__(self, item: int | slice) -> int | np.ndarray: ...
 
-    def __setitem__(self, key: int, value: int) -> None: ...
+    def __setitem__(self, key: int | slice, value: int | np.ndarray) -> None: ...
 
 Matrix = List[NTTModified]
 
 class VectorNTT:
     config: Any
-    vector: Matrix
+    array: np.ndarray
     ring: Ring
 
-    def __init__(self, config, vector: Optional[Matrix]=None, ring: Optional[Ring]=Ring.RQ) -> None: ...
+    def __init__(self, config, vector: Optional[Matrix | np.ndarray]=None, ring: Optional[Ring]=None) -> None: ...
+
+    @property
+    def vector(self) -> Matrix: ...
 
     def __getitem__(self, item: int) -> NTTModified: ...
 
+    def __len__(self) -> int: ...
+
     def to_list(self) -> List[List[int]]: ...
 
     def from_list(self, lst: List[List[int]]) -> None: ...
 
     def apply(self, function: Callable, *args: Optional[int], other: Optional[VectorNTT]=None) -> VectorNTT: ...
 
-    def ntt(self) -> VectorNTT: ...
+    def ntt(self, arithmetic: Optional[str] = None) -> VectorNTT: ...
 
-    def inverse(self) -> VectorNTT: ...
+    def inverse(self, arithmetic: Optional[str] = None) -> VectorNTT: ...
 
     def norm(self) -> int: ...
 